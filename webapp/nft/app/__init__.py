@@ -1,4 +1,5 @@
 import asyncio
+import time
 from logging import Logger
 from pathlib import Path
 
@@ -9,10 +10,13 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 
+from nft.app import metrics
 from nft.app.config import settings
 from nft.app.containers import Container
-from nft.app.internal import run_scanner
+from nft.app.internal import (ensure_indexes, run_gift_delivery,
+                              run_scanner, watch_nft_status_changes)
 from nft.app.routers import healthcheck, nft, call_center
+from nft.app.routers import metrics as metrics_router
 
 
 @inject
@@ -21,19 +25,38 @@ async def catch_exceptions_middleware(
         logger: Logger = Provide[Container.logger]):
     try:
         return await call_next(request)
-    except Exception as e:
-        print(e)
+    except Exception:
+        logger.exception('Request %s %s failed', request.method,
+                         request.url.path,
+                         extra={'method': request.method,
+                                'path': request.url.path})
         return JSONResponse(content={'detail': 'Internal server error'},
                             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+async def record_request_metrics(request: Request, call_next):
+    start = time.monotonic()
+    response = await call_next(request)
+
+    # Route template rather than the path keeps the number of series
+    # bounded, static files and unknown paths share one
+    route = request.scope.get('route')
+    metrics.http_request_seconds.labels(
+        request.method, route.path if route else 'other',
+        response.status_code).observe(time.monotonic() - start)
+
+    return response
+
+
 app = FastAPI(title=settings.APP_NAME, redoc_url=None, docs_url=None)
 app.container = Container()
 app.include_router(nft.router)
 app.include_router(healthcheck.router)
 app.include_router(call_center.router)
+app.include_router(metrics_router.router)
 
 app.middleware('http')(catch_exceptions_middleware)
+app.middleware('http')(record_request_metrics)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=['*'],
@@ -59,6 +82,53 @@ def init_resources():
     app.container.init_resources()
 
 
+@app.on_event('shutdown')
+async def shutdown_resources():
+    await app.container.health_prober().stop()
+    # Resource shutdowns are synchronous, the scanner closes its HTTP
+    # session here
+    await app.container.scanner().close()
+    app.container.shutdown_resources()
+
+
+@app.on_event('startup')
+async def create_indexes():
+    try:
+        await ensure_indexes()
+    except Exception:
+        # Staging refuses to start without the indexes hot queries need
+        if settings.FAIL_ON_COLLSCAN:
+            raise
+        app.container.logger().exception('Failed to ensure indexes')
+
+
+@app.on_event('startup')
+async def load_gifts_catalogue():
+    try:
+        await app.container.gifts_cache().load()
+    except Exception:
+        # The catalogue is loaded on the first lookup then
+        app.container.logger().exception('Failed to load gifts catalogue')
+
+
 @app.on_event('startup')
 def scan_blocks():
-    asyncio.create_task(run_scanner())
+    app.container.health_prober().watch_task(
+        'scanner', asyncio.create_task(run_scanner()))
+
+
+@app.on_event('startup')
+def deliver_gifts():
+    app.container.health_prober().watch_task(
+        'gift_delivery', asyncio.create_task(run_gift_delivery()))
+
+
+@app.on_event('startup')
+def probe_health():
+    app.container.health_prober().start()
+
+
+@app.on_event('startup')
+def watch_status_changes():
+    if settings.NFT_STATUS_CHANGE_STREAM_ENABLED:
+        asyncio.create_task(watch_nft_status_changes())
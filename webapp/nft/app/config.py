@@ -1,4 +1,7 @@
+from dataclasses import dataclass
 from os.path import abspath, dirname
+from types import MappingProxyType
+from typing import Mapping
 
 from dynaconf import Dynaconf
 
@@ -9,3 +12,32 @@ settings = Dynaconf(
     environments=True,
     settings_files=[f'{cwd}/settings.toml', f'{cwd}/.secrets.toml']
 )
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """Settings read on hot paths, computed once.
+
+    Reading `settings` goes through Dynaconf on every access and
+    `settings.as_dict()` copies the whole configuration, so request
+    handlers read these read-only values instead.
+    """
+
+    # Category id -> category name
+    nft_category_map: Mapping[str, str]
+    # Category id -> number of tokens in the category
+    category_token_map: Mapping[str, int]
+
+    @classmethod
+    def from_settings(cls, source: Dynaconf) -> 'RuntimeConfig':
+        return cls(
+            nft_category_map=MappingProxyType({
+                str(category_id): name for category_id, name
+                in source.get('NFT_CATEGORY_MAP').items()}),
+            category_token_map=MappingProxyType({
+                str(category_id): int(total) for category_id, total
+                in source.get('CATEGORY_TOKEN_MAP').items()})
+        )
+
+
+runtime_config = RuntimeConfig.from_settings(settings)
@@ -2,7 +2,11 @@ from dependency_injector import containers, providers
 from ml.platform.client import MLPlatformAsyncClient
 
 from nft.app.config import settings
-from nft.app.dependencies import NotificationSender, ScannerDatabaseState
+from nft.app.dependencies import (GiftOutbox, GiftsCache, HealthProber,
+                                  IntentIdGenerator,
+                                  NewBlockNotifier, NFTStatusBroker,
+                                  NFTStatusCache, NotificationSender,
+                                  ScannerDatabaseState)
 from nft.app.resources import (DbManagerResource, EventScannerResource,
                                LoggerResource)
 
@@ -10,9 +14,14 @@ from nft.app.resources import (DbManagerResource, EventScannerResource,
 class Container(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(
         modules=['.routers.nft',
+                 '.routers.metrics',
+                 '.routers.healthcheck',
                  '.routers.call_center',
                  '.internal.event_handler',
                  '.internal.scanner_actions',
+                 '.internal.gift_delivery',
+                 '.internal.indexes',
+                 '.internal.status_updates',
                  '.'
                  ])
 
@@ -36,9 +45,79 @@ class Container(containers.DeclarativeContainer):
         logger=logger
     )
 
+    nft_status_cache = providers.Singleton(
+        NFTStatusCache,
+        db=db_manager,
+        max_size=settings.NFT_STATUS_CACHE_SIZE,
+        ttl=settings.NFT_STATUS_CACHE_TTL_SECONDS,
+        logger=logger
+    )
+
+    nft_status_broker = providers.Singleton(
+        NFTStatusBroker,
+        max_subscribers=settings.NFT_STATUS_MAX_SUBSCRIBERS,
+        logger=logger
+    )
+
     scanner = providers.Resource(
         EventScannerResource,
         state=state,
+        nft_status_cache=nft_status_cache,
+        logger=logger
+    )
+
+    health_prober = providers.Singleton(
+        HealthProber,
+        db=db_manager,
+        scanner=scanner,
+        state=state,
+        interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+        timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+        thresholds=providers.Dict({
+            HealthProber.MONGO_PING: settings.HEALTH_MAX_MONGO_PING_SECONDS,
+            HealthProber.RPC_LATENCY: settings.HEALTH_MAX_RPC_LATENCY_SECONDS,
+            HealthProber.SCANNER_LAG_BLOCKS:
+                settings.HEALTH_MAX_SCANNER_LAG_BLOCKS,
+            HealthProber.SCANNER_LAG_SECONDS:
+                settings.HEALTH_MAX_SCANNER_LAG_SECONDS,
+            HealthProber.SECONDS_SINCE_CHUNK:
+                settings.HEALTH_MAX_SECONDS_SINCE_CHUNK
+        }),
+        readiness_checks=settings.HEALTH_READINESS_CHECKS,
+        max_probe_age=settings.HEALTH_MAX_PROBE_AGE_SECONDS,
+        logger=logger
+    )
+
+    block_notifier = providers.Singleton(
+        NewBlockNotifier,
+        ws_uri=settings.BLOCKCHAIN_WS_ADDRESS,
+        poll_interval=settings.SCAN_DELAY,
+        subscribed_poll_interval=settings.SUBSCRIBED_SCAN_DELAY,
+        reconnect_delay=settings.WS_RECONNECT_DELAY,
+        logger=logger
+    )
+
+    gifts_cache = providers.Singleton(
+        GiftsCache,
+        db=db_manager,
+        ttl=settings.GIFTS_CACHE_TTL_SECONDS,
+        max_missing=settings.GIFTS_CACHE_MAX_MISSING,
+        logger=logger
+    )
+
+    intent_id_generator = providers.Singleton(
+        IntentIdGenerator,
+        worker_id=settings.get('INTENT_ID_WORKER_ID'),
+        logger=logger
+    )
+
+    gift_outbox = providers.Singleton(
+        GiftOutbox,
+        db=db_manager,
+        max_attempts=settings.GIFT_DELIVERY_MAX_ATTEMPTS,
+        backoff_seconds=settings.GIFT_DELIVERY_BACKOFF_SECONDS,
+        max_backoff_seconds=settings.GIFT_DELIVERY_MAX_BACKOFF_SECONDS,
+        lease_seconds=settings.GIFT_DELIVERY_LEASE_SECONDS,
         logger=logger
     )
 
@@ -50,5 +129,12 @@ class Container(containers.DeclarativeContainer):
 
     notification_sender = providers.Singleton(
         NotificationSender,
-        notification_name=settings.NFT_CONVERSION_NOTIFICATION_NAME
+        notification_name=settings.NFT_CONVERSION_NOTIFICATION_NAME,
+        sms_rate_limit=settings.SMS_RATE_LIMIT,
+        sms_burst=settings.SMS_BURST,
+        sms_concurrency=settings.SMS_CONCURRENCY,
+        telegram_rate_limit=settings.TELEGRAM_RATE_LIMIT,
+        telegram_burst=settings.TELEGRAM_BURST,
+        telegram_concurrency=settings.TELEGRAM_CONCURRENCY,
+        digest_notification_name=settings.NFT_CONVERSION_DIGEST_NOTIFICATION_NAME
     )
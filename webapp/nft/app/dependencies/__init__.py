@@ -1,7 +1,30 @@
+from .block_batch_fetcher import BlockTimestampBatchFetcher
+from .chunk_size_controllers import (AIMDChunkSizeController,
+                                     HitMissChunkSizeController)
 from .event_scanner import EventScanner
 from .event_scanner_state import ScannerDatabaseState
-from .notification_sender import NotificationSender
+from .gift_outbox import GiftDeliveryStatus, GiftOutbox
+from .gifts_cache import GiftsCache
+from .health_prober import HealthCheck, HealthProber
+from .intent_id_generator import IntentIdGenerator
+from .new_block_notifier import NewBlockNotifier
+from .nft_status_broker import NFTStatusBroker
+from .nft_status_cache import NFTStatusCache
+from .notification_sender import Notification, NotificationSender
 
-__all__ = ['EventScanner',
+__all__ = ['AIMDChunkSizeController',
+           'BlockTimestampBatchFetcher',
+           'EventScanner',
+           'GiftDeliveryStatus',
+           'GiftOutbox',
+           'GiftsCache',
+           'HealthCheck',
+           'HealthProber',
+           'HitMissChunkSizeController',
+           'IntentIdGenerator',
+           'NewBlockNotifier',
+           'NFTStatusBroker',
+           'NFTStatusCache',
+           'Notification',
            'NotificationSender',
            'ScannerDatabaseState']
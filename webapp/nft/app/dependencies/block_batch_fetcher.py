@@ -0,0 +1,216 @@
+import asyncio
+import contextlib
+import datetime
+import itertools
+from logging import Logger
+
+import aiohttp
+
+
+class BatchRequestRejected(Exception):
+    """JSON-RPC node does not accept batch requests."""
+
+
+class BatchTooLarge(Exception):
+    """JSON-RPC node refuses a batch of this size."""
+
+
+class BlockTimestampBatchFetcher:
+    """Fetch block timestamps with JSON-RPC batch requests.
+
+    Many `eth_getBlockByNumber` calls (headers only, without full
+    transactions) are packed into a single HTTP POST. If the node answers
+    a batch with a JSON-RPC error, the fetcher switches to single JSON-RPC
+    calls for good. A batch refused as too large is split in halves.
+    """
+
+    def __init__(self, endpoint_uri: str, max_batch_size: int,
+                 concurrency: int, timeout: float, retries: int,
+                 retry_delay: float, max_retry_delay: float, logger: Logger):
+        """
+        :param endpoint_uri: HTTP JSON-RPC endpoint of the node
+        :param max_batch_size: How many calls we pack into one batch
+        :param concurrency: How many single calls may run at once
+         when batches are not supported
+        :param timeout: HTTP request timeout in seconds
+        :param retries: How many times a request is sent when the node is
+         throttling or fails with a 5xx status
+        :param retry_delay: Time to sleep before the first retry, doubled
+         on every next one
+        :param max_retry_delay: Maximum time to sleep between retries
+        :param logger: Logger object
+        """
+
+        self.endpoint_uri = endpoint_uri
+        self.max_batch_size = max_batch_size
+        self.concurrency = concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.logger = logger
+
+        self.batch_supported = True
+        self._request_ids = itertools.count(1)
+        self._session: aiohttp.ClientSession | None = None
+
+    async def fetch_timestamps(self, block_numbers: list[int]) -> dict[
+            int, datetime.datetime | None]:
+        """Get timestamps of the given blocks.
+
+        :return: dict(block number -> when this block was mined, None if
+         the block is not mined yet)
+        """
+
+        timestamps = {}
+        pending = list(block_numbers)
+
+        while pending:
+            batch = pending[:self.max_batch_size]
+            pending = pending[self.max_batch_size:]
+
+            if self.batch_supported:
+                try:
+                    timestamps.update(await self._fetch_batch(batch))
+                    continue
+                except BatchTooLarge:
+                    if len(batch) > 1:
+                        # The same blocks go again in smaller batches
+                        self.max_batch_size = len(batch) // 2
+                        self.logger.warning(
+                            'JSON-RPC batch of %d calls is too large, '
+                            'reducing the batch size to %d', len(batch),
+                            self.max_batch_size,
+                            extra={'batch_size': self.max_batch_size})
+                        pending = batch + pending
+                        continue
+                except BatchRequestRejected as e:
+                    self.logger.warning(
+                        'JSON-RPC batches are rejected by the node (%s), '
+                        'falling back to single calls', e)
+                    self.batch_supported = False
+
+            timestamps.update(await self._fetch_single(batch))
+
+        return timestamps
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _fetch_batch(self, block_numbers: list[int]) -> dict[
+            int, datetime.datetime | None]:
+        requests = {next(self._request_ids): block_num
+                    for block_num in block_numbers}
+
+        try:
+            responses = await self._post([
+                self._build_request(request_id, block_num)
+                for request_id, block_num in requests.items()])
+        except aiohttp.ClientResponseError as e:
+            if e.status == 413:
+                raise BatchTooLarge(e) from e
+            raise
+
+        # A node without batch support answers with a single error object
+        if not isinstance(responses, list):
+            if isinstance(responses, dict) and 'error' in responses:
+                raise BatchRequestRejected(responses['error'])
+            raise ValueError(f"Unexpected JSON-RPC batch response "
+                             f"{responses}")
+
+        timestamps = {}
+        for response in responses:
+            if (block_num := requests.get(response.get('id'))) is None:
+                continue
+
+            # Individual calls of a batch may fail e.g. due to rate limits,
+            # those are retried one by one below
+            if 'error' not in response:
+                timestamps[block_num] = _parse_timestamp(response['result'])
+
+        if failed := [block_num for block_num in block_numbers
+                      if block_num not in timestamps]:
+            timestamps.update(await self._fetch_single(failed))
+
+        return timestamps
+
+    async def _fetch_single(self, block_numbers: list[int]) -> dict[
+            int, datetime.datetime | None]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _fetch(block_num: int) -> datetime.datetime | None:
+            async with semaphore:
+                response = await self._post(self._build_request(
+                    next(self._request_ids), block_num))
+
+            if 'error' in response:
+                raise ValueError(f"eth_getBlockByNumber failed for block "
+                                 f"#{block_num}: {response['error']}")
+            return _parse_timestamp(response['result'])
+
+        timestamps = await asyncio.gather(*map(_fetch, block_numbers))
+        return dict(zip(block_numbers, timestamps))
+
+    async def _post(self, payload: dict | list) -> dict | list:
+        """Send a JSON-RPC request, retrying while the node is throttling,
+        unreachable or failing with a 5xx status.
+        """
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+
+        for i in range(self.retries):
+            try:
+                async with self._session.post(self.endpoint_uri,
+                                              json=payload) as response:
+                    if (_is_client_error(response.status)
+                            and response.status != 413):
+                        # Nodes may reject a request with an error status
+                        # and the JSON-RPC error as the body
+                        with contextlib.suppress(ValueError):
+                            body = await response.json(content_type=None)
+                            if isinstance(body, dict) and 'error' in body:
+                                return body
+
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+
+            except (aiohttp.ClientResponseError,
+                    aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError) as e:
+                if (isinstance(e, aiohttp.ClientResponseError)
+                        and _is_client_error(e.status)
+                        or i == self.retries - 1):
+                    raise
+
+                retry_delay = min(self.max_retry_delay,
+                                  self.retry_delay * 2 ** i)
+                self.logger.warning(
+                    'JSON-RPC request failed with %r, retrying in %s '
+                    'seconds', e, retry_delay,
+                    extra={'attempt': i + 1, 'retry_delay': retry_delay})
+                await asyncio.sleep(retry_delay)
+
+    @staticmethod
+    def _build_request(request_id: int, block_num: int) -> dict:
+        return {
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'method': 'eth_getBlockByNumber',
+            # Do not ask for full transactions, header is enough
+            'params': [hex(block_num), False]
+        }
+
+
+def _is_client_error(status: int) -> bool:
+    # Being throttled is worth a retry, unlike other 4xx statuses
+    return 400 <= status < 500 and status != 429
+
+
+def _parse_timestamp(block: dict | None) -> datetime.datetime | None:
+    # Block was not mined yet or minor chain reorganisation
+    if block is None:
+        return None
+    return datetime.datetime.utcfromtimestamp(int(block['timestamp'], 16))
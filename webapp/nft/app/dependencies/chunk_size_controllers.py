@@ -0,0 +1,63 @@
+from nft.app.utils import ChunkSizeController
+
+# Chunk sizes are `end_block - start_block`
+SINGLE_BLOCK = 0
+
+
+class HitMissChunkSizeController(ChunkSizeController):
+    """Grow the chunk while nothing is found, reset it on the first hit."""
+
+    def __init__(self, min_chunk_size: int, max_chunk_size: int,
+                 increase_factor: float, decrease_factor: float):
+        super().__init__(min_chunk_size, max_chunk_size)
+        self.increase_factor = increase_factor
+        self.decrease_factor = decrease_factor
+
+    def next_chunk_size(self, chunk_size: int, scan_duration: float,
+                        logs_found: int) -> int:
+        if logs_found > 0:
+            # When we encounter first events, reset the chunk size window
+            return self.decide(chunk_size, self.min_chunk_size, 'hit',
+                               scan_duration, logs_found)
+
+        return self.decide(chunk_size, chunk_size * self.increase_factor,
+                           'miss', scan_duration, logs_found)
+
+    def on_failure(self, chunk_size: int) -> int:
+        return self.decide(chunk_size, chunk_size * self.decrease_factor,
+                           'failure', min_chunk_size=SINGLE_BLOCK)
+
+
+class AIMDChunkSizeController(ChunkSizeController):
+    """Additive increase / multiplicative decrease of the chunk size.
+
+    The chunk grows by `increase_step` blocks while `eth_getLogs` answers
+    within `target_scan_seconds` and returns at most `max_logs` entries,
+    and is scaled down by `decrease_factor` otherwise.
+    """
+
+    def __init__(self, min_chunk_size: int, max_chunk_size: int,
+                 increase_step: int, decrease_factor: float,
+                 target_scan_seconds: float, max_logs: int):
+        super().__init__(min_chunk_size, max_chunk_size)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.target_scan_seconds = target_scan_seconds
+        self.max_logs = max_logs
+
+    def next_chunk_size(self, chunk_size: int, scan_duration: float,
+                        logs_found: int) -> int:
+        if scan_duration > self.target_scan_seconds:
+            return self.decide(chunk_size, chunk_size * self.decrease_factor,
+                               'slow', scan_duration, logs_found)
+
+        if logs_found > self.max_logs:
+            return self.decide(chunk_size, chunk_size * self.decrease_factor,
+                               'too many logs', scan_duration, logs_found)
+
+        return self.decide(chunk_size, chunk_size + self.increase_step,
+                           'within targets', scan_duration, logs_found)
+
+    def on_failure(self, chunk_size: int) -> int:
+        return self.decide(chunk_size, chunk_size * self.decrease_factor,
+                           'failure', min_chunk_size=SINGLE_BLOCK)
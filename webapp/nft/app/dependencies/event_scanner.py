@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import datetime
 import time
 from logging import Logger
@@ -10,8 +11,14 @@ from web3._utils.filters import construct_event_filter_params
 from web3.contract import Contract
 from web3.exceptions import BlockNotFound
 
+from nft.app import metrics
 from nft.app.config import settings
-from nft.app.utils import EventScannerState
+from nft.app.dependencies.block_batch_fetcher import BlockTimestampBatchFetcher
+from nft.app.dependencies.chunk_size_controllers import \
+    HitMissChunkSizeController
+from nft.app.dependencies.nft_status_cache import NFTStatusCache
+from nft.app.utils import (BlockWatermark, ChunkSizeController,
+                           EventScannerState, LRUCache)
 
 
 class EventScanner:
@@ -21,7 +28,10 @@ class EventScanner:
 
     def __init__(self, web3: Web3, contract: Contract,
                  state: EventScannerState, events: list, filters: dict,
-                 logger: Logger):
+                 logger: Logger,
+                 block_fetcher: BlockTimestampBatchFetcher | None = None,
+                 nft_status_cache: NFTStatusCache | None = None,
+                 chunk_size_controller: ChunkSizeController | None = None):
         """
         :param contract: Contract
         :param events: List of web3 Event we scan
@@ -29,6 +39,12 @@ class EventScanner:
         :param state: Scanner state
         :param web3: Web3 object
         :param logger: Logger object
+        :param block_fetcher: Optional JSON-RPC batching layer used to
+         fetch block timestamps
+        :param nft_status_cache: Cache of NFT conversion statuses to
+         invalidate when an intent turns out to be completed
+        :param chunk_size_controller: Decides the `eth_getLogs` block range,
+         grows the range until the first hit by default
         """
 
         self.contract = contract
@@ -37,12 +53,15 @@ class EventScanner:
         self.events = events
         self.filters = filters
         self.logger = logger
+        self.block_fetcher = block_fetcher
+        self.nft_status_cache = nft_status_cache
 
         # Our JSON-RPC throttling parameters
         self.min_scan_chunk_size = settings.MIN_SCAN_CHUNK_SIZE
         self.max_scan_chunk_size = settings.MAX_SCAN_CHUNK_SIZE
         self.max_request_retries = settings.MAX_REQUEST_RETRIES
         self.request_retry_seconds = settings.REQUEST_RETRY_SECONDS
+        self.request_retry_min_seconds = settings.REQUEST_RETRY_MIN_SECONDS
 
         # Factor how fast we increase the chunk size if results are found
         # # (slow down scan after starting to get hits)
@@ -51,6 +70,34 @@ class EventScanner:
         # Factor how was we increase chunk size if no results found
         self.chunk_size_increase = settings.CHUNK_SIZE_INCREASE
 
+        self.chunk_size_controller = (
+            chunk_size_controller or HitMissChunkSizeController(
+                min_chunk_size=self.min_scan_chunk_size,
+                max_chunk_size=self.max_scan_chunk_size,
+                increase_factor=self.chunk_size_increase,
+                decrease_factor=self.chunk_size_decrease))
+
+        # How many intent ids we resolve in a single `$in` query
+        self.intent_lookup_batch_size = settings.INTENT_LOOKUP_BATCH_SIZE
+
+        # Block timestamps survive between chunks, so the blocks rescanned
+        # for reorg safety and neighbouring chunks do not hit JSON-RPC again
+        self.block_timestamps = LRUCache(settings.BLOCK_TIMESTAMP_CACHE_SIZE)
+        self.block_timestamp_concurrency = settings.BLOCK_TIMESTAMP_CONCURRENCY
+
+        # How many fetched chunks may wait for processing
+        self.scan_pipeline_depth = settings.SCAN_PIPELINE_DEPTH
+
+        # Historical backfill parameters
+        self.backfill_workers = settings.BACKFILL_WORKERS
+        self.backfill_range_size = settings.BACKFILL_RANGE_SIZE
+
+    async def close(self):
+        """Release HTTP connections of the JSON-RPC batching layer."""
+
+        if self.block_fetcher:
+            await self.block_fetcher.close()
+
     async def get_block_timestamp(self, block_num: int) -> datetime.datetime | None:
         """Get Ethereum block timestamp"""
 
@@ -63,6 +110,62 @@ class EventScanner:
         last_time = block_info["timestamp"]
         return datetime.datetime.utcfromtimestamp(last_time)
 
+    async def get_block_when(self, block_num: int) -> datetime.datetime | None:
+        """Get block timestamp from the cache, fetching it if needed."""
+
+        if block_num not in self.block_timestamps:
+            await self.prefetch_block_timestamps([block_num])
+        return self.block_timestamps.get(block_num)
+
+    async def prefetch_block_timestamps(self, block_numbers: list[int]):
+        """Concurrently fetch timestamps of all blocks missing in the cache."""
+
+        missing = [block_num for block_num in dict.fromkeys(block_numbers)
+                   if block_num not in self.block_timestamps]
+        if not missing:
+            return
+
+        if self.block_fetcher:
+            timestamps = await self.block_fetcher.fetch_timestamps(missing)
+
+        else:
+            semaphore = asyncio.Semaphore(self.block_timestamp_concurrency)
+
+            async def _fetch(block_num: int) -> datetime.datetime | None:
+                async with semaphore:
+                    return await self.get_block_timestamp(block_num)
+
+            timestamps = dict(zip(
+                missing, await asyncio.gather(*map(_fetch, missing))))
+
+        for block_num, block_when in timestamps.items():
+            # Do not remember blocks which are not mined yet
+            if block_when is not None:
+                self.block_timestamps.set(block_num, block_when)
+
+    async def get_completed_intent_ids(self, intent_ids: list[int]) -> set[int]:
+        """Resolve which of the given intents are already completed.
+
+        Ids are looked up with `$in` queries of at most
+        `intent_lookup_batch_size` entries, so a chunk costs a constant
+        number of database round trips instead of one per event.
+        """
+
+        from nft.app.internal import IntentRequestStatus
+
+        unique_ids = list(dict.fromkeys(intent_ids))
+        completed = set()
+
+        for i in range(0, len(unique_ids), self.intent_lookup_batch_size):
+            batch = unique_ids[i:i + self.intent_lookup_batch_size]
+            async for intent_request in self.state.db.intent_ids.find(
+                    filter={'$and': [{'intent_id': {'$in': batch}},
+                                     {'status': IntentRequestStatus.COMPLETED.value}]},
+                    projection={'intent_id': True, '_id': False}):
+                completed.add(intent_request['intent_id'])
+
+        return completed
+
     def get_suggested_scan_start_block(self) -> int:
         """Get where we should start to scan for new token events."""
 
@@ -81,30 +184,27 @@ class EventScanner:
     def get_last_scanned_block(self) -> int:
         return self.state.get_last_scanned_block()
 
-    def delete_potentially_forked_block_data(self, after_block: int) -> None:
+    async def delete_potentially_forked_block_data(self,
+                                                   after_block: int) -> None:
         """Purge old data in the case of blockchain reorganisation."""
-        self.state.delete_data(after_block)
+        await self.state.delete_data(after_block)
 
-    async def scan_chunk(self, start_block, end_block) -> tuple[
-            int, datetime.datetime, list]:
-        """Read and process events between to block numbers.
+        for block_num in [block_num for block_num in self.block_timestamps
+                          if block_num >= after_block]:
+            self.block_timestamps.pop(block_num)
+
+    async def fetch_chunk(self, start_block, end_block) -> tuple[
+            int, list, float]:
+        """Read events between to block numbers without processing them.
 
         Dynamically decrease the size of the chunk if the case JSON-RPC server pukes out.
 
-        :return: tuple(actual end block number, when this block was mined, processed events)
+        :return: tuple(actual end block number, events in block order,
+         seconds the successful `eth_getLogs` calls took)
         """
 
-        block_timestamps = {}
-        get_block_timestamp = self.get_block_timestamp
-
-        # Cache block timestamps to reduce some RPC overhead
-        async def get_block_when(block_num) -> datetime.datetime:
-            if block_num not in block_timestamps:
-                block_timestamps[block_num] = await get_block_timestamp(
-                    block_num)
-            return block_timestamps[block_num]
-
-        all_processed = []
+        all_events = []
+        get_logs_duration = 0.0
 
         for event_type in self.events:
 
@@ -115,67 +215,120 @@ class EventScanner:
                     event_type,
                     self.filters,
                     from_block=_start_block,
-                    to_block=_end_block)
+                    to_block=_end_block,
+                    logger=self.logger)
 
             # Do `n` retries on `eth_getLogs`,
             # throttle down block range if needed
-            end_block, events = await _retry_web3_call(
+            end_block, events, duration = await _retry_web3_call(
                 _fetch_events,
                 start_block=start_block,
                 end_block=end_block,
                 retries=self.max_request_retries,
-                delay=self.request_retry_seconds)
+                delay=self.request_retry_seconds,
+                min_delay=self.request_retry_min_seconds,
+                shrink=self.chunk_size_controller.on_failure,
+                logger=self.logger)
 
-            for evt in events:
-                # Integer of the log index position
-                # in the block, null when its pending
-                idx = evt["logIndex"]
+            all_events += events
+            get_logs_duration += duration
 
-                # We cannot avoid minor chain reorganisations, but
-                # at least we must avoid blocks that are not mined yet
-                assert idx is not None, "Tried to scan a pending block"
+        # The range might have been throttled down by a later event type
+        all_events = sorted(
+            (evt for evt in all_events if evt["blockNumber"] <= end_block),
+            key=lambda evt: (evt["blockNumber"], evt["logIndex"]))
 
-                from nft.app.internal import IntentRequestStatus
+        # Warm up the timestamp cache for every block we are going to touch
+        await self.prefetch_block_timestamps(
+            [evt["blockNumber"] for evt in all_events])
 
-                event_is_processed = await self.state.db.intent_ids.find_one(
-                    filter={'$and': [{'intent_id': evt['args']['presentIntent']},
-                                     {'status': IntentRequestStatus.COMPLETED.value}]})
+        return end_block, all_events, get_logs_duration
 
-                if event_is_processed:
-                    continue
+    async def process_chunk(self, events: list) -> list:
+        """Process fetched events of a chunk in block order.
 
-                block_number = evt["blockNumber"]
+        :return: processed events
+        """
+
+        all_processed = []
+
+        # Resolve "already completed?" for the whole chunk at once
+        completed_intent_ids = await self.get_completed_intent_ids(
+            [evt['args']['presentIntent'] for evt in events])
+
+        for evt in events:
+            # Integer of the log index position
+            # in the block, null when its pending
+            idx = evt["logIndex"]
+
+            # We cannot avoid minor chain reorganisations, but
+            # at least we must avoid blocks that are not mined yet
+            assert idx is not None, "Tried to scan a pending block"
+
+            block_number = evt["blockNumber"]
+
+            # Get UTC time when this event happened (block mined timestamp)
+            # from our in-memory cache
+            block_when = await self.get_block_when(block_number)
+
+            if evt['args']['presentIntent'] in completed_intent_ids:
+                # Completed e.g. by another replica or on a previous cycle.
+                # The rescanned blocks were purged from the state, so the
+                # event is stored again, only gifts are not sent twice
+                await self.state.process_event(block_when, evt,
+                                               send_gifts=False)
+
+                # The status this process has cached may still be pending
+                if self.nft_status_cache is not None:
+                    self.nft_status_cache.invalidate(
+                        str(evt['args']['level']),
+                        str(evt['args']['tokenTokenIdInLevel']))
+                continue
 
-                # Get UTC time when this event happened (block mined timestamp)
-                # from our in-memory cache
-                block_when = await get_block_when(block_number)
+            self.logger.debug(
+                'Processing event %s, block #%d', evt['event'], block_number,
+                extra={'event_name': evt['event'],
+                       'block_number': block_number,
+                       'intent_id': evt['args']['presentIntent']})
+            processed = await self.state.process_event(block_when, evt)
+            all_processed.append(processed)
+            metrics.scanner_events_processed.inc()
 
-                print(
-                    f"Processing event {evt['event']}, block #{evt['blockNumber']}")
-                processed = await self.state.process_event(block_when, evt)
-                all_processed.append(processed)
+            # The same intent must not be handled twice within a chunk
+            completed_intent_ids.add(evt['args']['presentIntent'])
 
-        end_block_timestamp = await get_block_when(end_block)
-        return end_block, end_block_timestamp, all_processed
+        return all_processed
 
     def estimate_next_chunk_size(self, current_chunk_size: int,
-                                 event_found_count: int) -> int:
+                                 event_found_count: int,
+                                 scan_duration: float = 0.0) -> int:
         """Try to figure out optimal chunk size."""
 
-        if event_found_count > 0:
-            # When we encounter first events, reset the chunk size window
-            current_chunk_size = self.min_scan_chunk_size
-        else:
-            current_chunk_size *= self.chunk_size_increase
+        next_chunk_size = self.chunk_size_controller.next_chunk_size(
+            current_chunk_size, scan_duration, event_found_count)
+
+        metrics.scanner_chunk_size.set(next_chunk_size)
 
-        current_chunk_size = max(self.min_scan_chunk_size, current_chunk_size)
-        current_chunk_size = min(self.max_scan_chunk_size, current_chunk_size)
-        return int(current_chunk_size)
+        if next_chunk_size != current_chunk_size:
+            self.logger.info(
+                'Chunk size changed %d -> %d: %s', current_chunk_size,
+                next_chunk_size,
+                self.chunk_size_controller.decisions[-1].reason,
+                extra={'previous_chunk_size': current_chunk_size,
+                       'chunk_size': next_chunk_size,
+                       'events_count': event_found_count,
+                       'duration': scan_duration})
+
+        return next_chunk_size
 
     async def scan(self, start_block, end_block, start_chunk_size=5) -> tuple[
             list, int]:
         """Perform chunks scan.
 
+        Fetching runs as a separate task which stays up to
+        `scan_pipeline_depth` chunks ahead of event processing, so the scan
+        takes as long as the slower of both stages.
+
         :param start_block: The first block included in the scan
         :param end_block: The last block included in the scan
         :param start_chunk_size: How many blocks we try to fetch over
@@ -186,86 +339,268 @@ class EventScanner:
         assert start_block <= end_block, ("Chunks are processed faster than"
                                           " new blocks are mined")
 
-        current_block = start_block
+        # Fetched chunks waiting to be processed, `None` marks the end
+        chunks = asyncio.Queue(maxsize=self.scan_pipeline_depth)
+
+        async def _fetch_chunks():
+            current_block = start_block
+            chunk_size = start_chunk_size
+
+            try:
+                while current_block <= end_block:
+                    estimated_end_block = min(current_block + chunk_size,
+                                              end_block)
+
+                    actual_end_block, events, last_scan_duration = \
+                        await self.fetch_chunk(current_block,
+                                               estimated_end_block)
+                    last_logs_found = len(events)
+
+                    self.logger.info(
+                        'Fetched %d events from blocks %d - %d, eth_getLogs '
+                        'took %.3f seconds', last_logs_found, current_block,
+                        actual_end_block, last_scan_duration,
+                        extra={'start_block': current_block,
+                               'end_block': actual_end_block,
+                               'chunk_size': chunk_size,
+                               'events_count': last_logs_found,
+                               'duration': last_scan_duration})
+
+                    # Try to guess how many blocks to fetch over
+                    # `eth_getLogs` API next time, starting from the range
+                    # we actually got after possible retries. Only the
+                    # latency of `eth_getLogs` counts, not retry back-off
+                    # or block timestamp lookups
+                    chunk_size = self.estimate_next_chunk_size(
+                        actual_end_block - current_block, last_logs_found,
+                        last_scan_duration)
+
+                    await chunks.put((actual_end_block, events))
+
+                    # Set where the next chunk starts
+                    current_block = actual_end_block + 1
+
+            except Exception as e:
+                # Let the consumer re-raise the failure
+                await chunks.put(e)
+
+            else:
+                await chunks.put(None)
+
+        fetcher = asyncio.create_task(_fetch_chunks())
 
-        # Scan in chunks, commit between
-        chunk_size = start_chunk_size
-        last_scan_duration = last_logs_found = 0
         total_chunks_scanned = 0
 
         # All processed entries we got on this scan cycle
         all_processed = []
 
-        while current_block <= end_block:
-            estimated_end_block = current_block + chunk_size
-            print(
-                f"Scanning token's conversion for blocks: "
-                f"{current_block} - {estimated_end_block}, chunk size "
-                f"{chunk_size}, last chunk scan took {last_scan_duration},"
-                f" last logs found {last_logs_found}")
+        try:
+            while (chunk := await chunks.get()) is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+
+                current_end, events = chunk
+                all_processed += await self.process_chunk(events)
 
-            start = time.time()
-            actual_end_block, end_block_timestamp, new_entries = await self.scan_chunk(
-                current_block, estimated_end_block)
+                # The chunk is done only when all its events are processed
+                total_chunks_scanned += 1
+                await self.state.end_chunk(current_end)
 
-            current_end = actual_end_block
+        finally:
+            fetcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await fetcher
 
-            last_scan_duration = time.time() - start
-            all_processed += new_entries
+        return all_processed, total_chunks_scanned
 
-            # Try to guess how many blocks to fetch over `eth_getLogs` API
-            # next time
-            chunk_size = self.estimate_next_chunk_size(chunk_size,
-                                                       len(new_entries))
+    async def tail(self, start_block, end_block) -> tuple[list, int]:
+        """Scan the few blocks mined since the previous cycle in one go.
 
-            # Set where the next chunk starts
-            current_block = current_end + 1
-            total_chunks_scanned += 1
-            await self.state.end_chunk(current_end)
+        Used once the scanner has caught up: a cycle costs a single
+        `eth_getLogs` call, plus timestamps of blocks with new events.
+
+        :param start_block: The first block included in the scan
+        :param end_block: The last block included in the scan
+        :return: tuple(All processed events, number of chunks used)
+        """
+
+        if start_block > end_block:
+            return [], 0
+
+        end_block, events, _ = await self.fetch_chunk(start_block, end_block)
+        all_processed = await self.process_chunk(events)
+        await self.state.end_chunk(end_block)
+
+        return all_processed, 1
+
+    async def backfill(self, start_block, end_block,
+                       start_chunk_size=5) -> tuple[list, int]:
+        """Scan a historical block range with concurrent workers.
+
+        The range is split into disjoint sub-ranges of
+        `backfill_range_size` blocks which are picked up by
+        `backfill_workers` tasks. The last scanned block in the state only
+        advances up to the highest contiguous completed block, so a crash
+        never skips a sub-range. Events of chunks completed past a slow
+        sub-range are saved right away instead of waiting in memory.
+
+        :param start_block: The first block included in the scan
+        :param end_block: The last block included in the scan
+        :param start_chunk_size: How many blocks every worker tries to
+        fetch over JSON-RPC on the first attempt
+        :return: tuple(All processed events, number of chunks used)
+        """
+
+        assert start_block <= end_block, ("Chunks are processed faster than"
+                                          " new blocks are mined")
+
+        sub_ranges = asyncio.Queue()
+        for sub_start in range(start_block, end_block + 1,
+                               self.backfill_range_size):
+            sub_ranges.put_nowait(
+                (sub_start,
+                 min(sub_start + self.backfill_range_size - 1, end_block)))
+
+        watermark = BlockWatermark(start_block - 1)
+
+        total_chunks_scanned = 0
+
+        # All processed entries we got on this scan cycle
+        all_processed = []
+
+        async def _worker(worker_id: int):
+            nonlocal total_chunks_scanned
+
+            while not sub_ranges.empty():
+                sub_start, sub_end = sub_ranges.get_nowait()
+
+                current_block = sub_start
+                chunk_size = start_chunk_size
+                metrics.scanner_backfill_range_end.labels(worker_id).set(
+                    sub_end)
+
+                while current_block <= sub_end:
+                    estimated_end_block = min(current_block + chunk_size,
+                                              sub_end)
+
+                    current_end, events, scan_duration = \
+                        await self.fetch_chunk(current_block,
+                                               estimated_end_block)
+
+                    self.logger.info(
+                        'Backfill worker #%d fetched %d events from blocks '
+                        '%d - %d, eth_getLogs took %.3f seconds', worker_id,
+                        len(events), current_block, current_end,
+                        scan_duration,
+                        extra={'worker_id': worker_id,
+                               'start_block': current_block,
+                               'end_block': current_end,
+                               'chunk_size': chunk_size,
+                               'events_count': len(events),
+                               'duration': scan_duration})
+
+                    all_processed.extend(await self.process_chunk(events))
+
+                    chunk_size = self.estimate_next_chunk_size(
+                        current_end - current_block, len(events),
+                        scan_duration)
+                    total_chunks_scanned += 1
+                    metrics.scanner_backfill_block.labels(worker_id).set(
+                        current_end)
+
+                    if (last_contiguous := watermark.complete(
+                            current_block, current_end)) is not None:
+                        await self.state.end_chunk(last_contiguous)
+                    elif events:
+                        # The cursor stays behind, the events are purged
+                        # and rescanned with the rest after a crash
+                        await self.state.save()
+
+                    current_block = current_end + 1
+
+        workers = [asyncio.create_task(_worker(worker_id))
+                   for worker_id in range(self.backfill_workers)]
+        try:
+            await asyncio.gather(*workers)
+
+        finally:
+            # Stop the rest of the workers if one of them failed
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
         return all_processed, total_chunks_scanned
 
 
-async def _retry_web3_call(func, start_block,
-                           end_block, retries, delay) -> tuple[int, list]:
+async def _retry_web3_call(func, start_block, end_block, retries, delay,
+                           min_delay, shrink,
+                           logger: Logger) -> tuple[int, list, float]:
     """A custom retry loop to throttle down block range.
 
     If our JSON-RPC server cannot serve all incoming `eth_getLogs` in a
     single request, we retry and throttle down block range for every retry.
 
+    :return: tuple(actual end block number, events, seconds the successful
+     call took)
+
     :param func: A callable that triggers Ethereum JSON-RPC,
      as func(start_block, end_block)
     :param start_block: The initial start block of the block range
     :param end_block: The initial start block of the block range
     :param retries: How many times we retry
-    :param delay: Time to sleep between retries
+    :param delay: Maximum time to sleep between retries
+    :param min_delay: Time to sleep before the first retry, doubled
+     on every next one
+    :param shrink: A callable that gives the block range to retry with,
+     as shrink(failed block range)
+    :param logger: Logger object
     """
     for i in range(retries):
+        start = time.monotonic()
         try:
-            return end_block, await func(start_block, end_block)
+            events = await func(start_block, end_block)
         except Exception as e:
+            metrics.scanner_get_logs_seconds.labels('failure').observe(
+                time.monotonic() - start)
+
             if i < retries - 1:
-                print(
-                    f"Retrying events for block range"
-                    f" {start_block} - {end_block} ({end_block - start_block})"
-                    f" failed with {e}, retrying in {delay} seconds")
+                metrics.scanner_get_logs_retries.inc()
+                retry_delay = min(delay, min_delay * 2 ** i)
+                logger.warning(
+                    'Retrying events for block range %d - %d (%d) failed '
+                    'with %s, retrying in %s seconds', start_block, end_block,
+                    end_block - start_block, e, retry_delay,
+                    extra={'start_block': start_block,
+                           'end_block': end_block,
+                           'attempt': i + 1,
+                           'retry_delay': retry_delay})
 
                 # Decrease the `eth_getBlocks` range
-                end_block = start_block + ((end_block - start_block) // 2)
+                end_block = min(end_block,
+                                start_block + shrink(end_block - start_block))
                 # Let the JSON-RPC to recover e.g. from restart
-                await asyncio.sleep(delay)
+                await asyncio.sleep(retry_delay)
                 continue
             else:
-                print("Out of retries")
+                logger.error(
+                    'Out of retries for block range %d - %d', start_block,
+                    end_block, extra={'start_block': start_block,
+                                      'end_block': end_block,
+                                      'attempt': i + 1})
                 raise
 
+        duration = time.monotonic() - start
+        metrics.scanner_get_logs_seconds.labels('success').observe(duration)
+        return end_block, events, duration
+
 
 async def _fetch_events_for_all_contracts(
         web3,
         event,
         argument_filters: dict,
         from_block: int,
-        to_block: int) -> list:
+        to_block: int,
+        logger: Logger) -> list:
     """Get events using eth_getLogs API."""
 
     if from_block is None:
@@ -294,7 +629,8 @@ async def _fetch_events_for_all_contracts(
         toBlock=to_block
     )
 
-    print(f"Querying eth_getLogs with the following parameters: {event_filter_params}")
+    logger.debug('Querying eth_getLogs with the following parameters: %s',
+                 event_filter_params)
 
     # Call JSON-RPC API on your Ethereum node.
     # get_logs() returns raw AttributedDict entries
@@ -306,6 +642,8 @@ async def _fetch_events_for_all_contracts(
         evt = get_event_data(codec, abi, log)
         all_events.append(evt)
 
-    print(f"Retrieved the following event data "
-          f"from blocks {from_block} - {to_block}: {all_events}")
+    logger.debug('Retrieved %d events from blocks %d - %d', len(all_events),
+                 from_block, to_block,
+                 extra={'start_block': from_block, 'end_block': to_block,
+                        'events_count': len(all_events)})
     return all_events
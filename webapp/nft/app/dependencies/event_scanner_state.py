@@ -3,19 +3,40 @@ import time
 from logging import Logger
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DESCENDING, UpdateOne
 from web3.datastructures import AttributeDict
 
+from nft.app import metrics
+from nft.app.config import settings
 from nft.app.utils import EventScannerState
 
 
 class ScannerDatabaseState(EventScannerState):
-    """Store the state of scanned blocks and all events."""
+    """Store the state of scanned blocks and all events.
+
+    The last scanned block is kept in a tiny cursor document, while events
+    live in their own collection keyed by block, transaction and log index.
+    Only events which are not saved yet are held in `current_state`.
+
+    This process is the only writer, so once restored the in-memory state
+    stays authoritative and the database is only written to.
+    """
+
+    CURSOR_ID = 'event_scanner'
 
     def __init__(self, state: AsyncIOMotorDatabase, logger: Logger):
         self.current_state: dict | None = None
         self.db = state
         self.logger = logger
         self.last_save = 0
+        self.save_interval = settings.STATE_SAVE_INTERVAL
+        # When the last chunk was completed, the scanner is stuck if this
+        # gets too old
+        self.last_chunk_at: float | None = None
+
+        # The highest block with a stored event, lets us skip purging
+        # blocks which hold nothing
+        self.last_event_block = 0
 
     def reset(self):
         """Create initial state of nothing scanned."""
@@ -24,38 +45,99 @@ class ScannerDatabaseState(EventScannerState):
             "last_scanned_block": 0,
             "blocks": {},
         }
+        self.last_event_block = 0
 
     async def restore(self):
         """Restore the last scan state from a database."""
 
-        if not (state := await self.db.blocks.find_one(filter={})):
-            print("State starting from scratch")
+        cursor = await self.db.scanner_cursor.find_one(
+            filter={'_id': self.CURSOR_ID})
+
+        # Fall back to the cursor of the former single-document state
+        if not cursor:
+            cursor = await self.db.blocks.find_one(
+                filter={}, projection={'last_scanned_block': True})
+
+        if not cursor:
+            self.logger.info('State starting from scratch')
             self.reset()
 
         else:
-            print(f"Restored the state, previously "
-                  f"{state['last_scanned_block']} blocks have been scanned")
+            self.logger.info(
+                'Restored the state, previously %d blocks have been scanned',
+                cursor['last_scanned_block'],
+                extra={'last_scanned_block': cursor['last_scanned_block']})
+
+            self.current_state = {
+                "last_scanned_block": cursor['last_scanned_block'],
+                "blocks": {},
+            }
 
-            self.current_state = state
+            last_event = await self.db.scanned_events.find_one(
+                filter={}, projection={'block_number': True},
+                sort=[('block_number', DESCENDING)])
+            self.last_event_block = last_event['block_number'] if last_event else 0
 
     async def save(self):
-        """Save everything we have scanned so far in a database."""
-        await self.db.blocks.find_one_and_replace(
-            filter={},
-            replacement=self.current_state,
+        """Save new events and the last scanned block in a database."""
+
+        # Detach pending events first, more may arrive while we are writing
+        blocks = self.current_state["blocks"]
+        self.current_state["blocks"] = {}
+
+        if events := [
+            UpdateOne(filter={'_id': f'{block_number}-{txhash}-{log_index}'},
+                      update={'$set': {'block_number': int(block_number),
+                                       'transaction_hash': txhash,
+                                       'log_index': int(log_index),
+                                       **event_data}},
+                      upsert=True)
+            for block_number, block in blocks.items()
+            for txhash, logs in block.items()
+            for log_index, event_data in logs.items()
+        ]:
+            try:
+                await self.db.scanned_events.bulk_write(events, ordered=False)
+            except BaseException:
+                # Keep the events for the next save, upserts are idempotent
+                self._merge_blocks(blocks)
+                raise
+
+        await self.db.scanner_cursor.update_one(
+            filter={'_id': self.CURSOR_ID},
+            update={'$set': {'last_scanned_block':
+                             self.current_state["last_scanned_block"]}},
             upsert=True
         )
         self.last_save = time.time()
 
+    def _merge_blocks(self, blocks: dict):
+        """Put detached events back to the pending ones."""
+
+        for block_number, block in blocks.items():
+            for txhash, logs in block.items():
+                self.current_state["blocks"].setdefault(
+                    block_number, {}).setdefault(txhash, {}).update(logs)
+
     def get_last_scanned_block(self) -> int:
         """The number of the last block we have stored."""
         return self.current_state["last_scanned_block"]
 
-    def delete_data(self, since_block):
+    async def delete_data(self, since_block):
         """Remove potentially reorganised blocks from the scan data."""
-        for block_num in range(since_block, self.get_last_scanned_block()):
-            if block_num in self.current_state["blocks"]:
-                del self.current_state["blocks"][block_num]
+
+        # Only events not saved yet are held in memory, which is nothing
+        # unless the last save failed. Blocks are keyed by their string
+        # number
+        for block_number in [block_number for block_number
+                             in self.current_state["blocks"]
+                             if int(block_number) >= since_block]:
+            del self.current_state["blocks"][block_number]
+
+        if since_block <= self.last_event_block:
+            await self.db.scanned_events.delete_many(
+                filter={'block_number': {'$gte': since_block}})
+            self.last_event_block = since_block - 1
 
     def start_chunk(self, block_number: int):
         pass
@@ -64,22 +146,31 @@ class ScannerDatabaseState(EventScannerState):
         """Save at the end of each block, so we can resume
          in the case of a crash or CTRL+C
          """
+        # Rescanned reorg-safe blocks are not counted twice
+        if (scanned := block_number
+                - self.current_state["last_scanned_block"]) > 0:
+            metrics.scanner_blocks_scanned.inc(scanned)
+        metrics.scanner_last_scanned_block.set(block_number)
+
         # Next time the scanner is started we will resume from this block
         self.current_state["last_scanned_block"] = block_number
+        self.last_chunk_at = time.monotonic()
 
-        # Save into the database for every minute
-        if time.time() - self.last_save > 60:
+        # Events are saved with the chunk they belong to, a bare cursor
+        # move is saved once in a while. Saving costs as much as the events
+        # of this chunk
+        if (self.current_state["blocks"]
+                or time.time() - self.last_save > self.save_interval):
             await self.save()
 
     async def process_event(self, block_when: datetime.datetime | None,
-                            event: AttributeDict) -> str:
+                            event: AttributeDict,
+                            send_gifts: bool = True) -> str:
         """Process event data."""
         # Events are keyed by their transaction hash and log index
         # One transaction may contain multiple events
         # and each one of those gets their own log index
 
-        print(f'Get event data from block #{event["blockNumber"]}: {event}')
-
         log_index = str(event['logIndex'])  # Log index within the block
         txhash = event['transactionHash'].hex()  # Transaction hash
         block_number = str(event['blockNumber'])
@@ -97,6 +188,8 @@ class ScannerDatabaseState(EventScannerState):
         # that contains all transactions by txhash
         if block_number not in self.current_state["blocks"]:
             self.current_state["blocks"][block_number] = {}
+            self.last_event_block = max(self.last_event_block,
+                                        event['blockNumber'])
 
         block = self.current_state["blocks"][block_number]
         if txhash not in block:
@@ -108,8 +201,9 @@ class ScannerDatabaseState(EventScannerState):
         self.current_state["blocks"][block_number][txhash][
             log_index] = event_data
 
-        from nft.app.internal import check_event_and_send_gifts
-        await check_event_and_send_gifts(args)
+        if send_gifts:
+            from nft.app.internal import check_event_and_send_gifts
+            await check_event_and_send_gifts(args)
 
         # Return a pointer that allows us to look up this event later if needed
         return f"{block_number}-{txhash}-{log_index}"
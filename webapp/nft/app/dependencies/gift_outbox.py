@@ -0,0 +1,191 @@
+import asyncio
+import contextlib
+import datetime
+import uuid
+from enum import Enum
+from logging import Logger
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReturnDocument
+
+
+class GiftDeliveryStatus(str, Enum):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+
+class GiftOutbox:
+    """Durable queue of gift deliveries stored in a database.
+
+    Records are keyed by intent id, so enqueueing the same intent twice is
+    a no-op. A claimed record is leased for `lease_seconds`: if the worker
+    dies, the record becomes available again once the lease expires. The
+    outcome of a delivery is only recorded while the worker holds the lease.
+    Every claim counts as an attempt, so a record which keeps losing its
+    lease fails after `max_attempts` as well.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, max_attempts: int,
+                 backoff_seconds: float, max_backoff_seconds: float,
+                 lease_seconds: float, logger: Logger):
+        """
+        :param db: Database object
+        :param max_attempts: How many times we try to deliver gifts
+        :param backoff_seconds: Delay before the first retry, doubled
+         on every next one
+        :param max_backoff_seconds: Maximum delay between retries
+        :param lease_seconds: How long a claimed record is reserved
+         for a worker
+        :param logger: Logger object
+        """
+
+        self.db = db
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self.logger = logger
+
+        self._new_records = asyncio.Event()
+
+    async def enqueue(self, intent_request: dict):
+        """Add a delivery of gifts for the completed intent request."""
+
+        now = datetime.datetime.utcnow()
+
+        await self.db.gift_outbox.update_one(
+            filter={'_id': intent_request['intent_id']},
+            update={'$setOnInsert': {
+                'phone': intent_request['phone'],
+                'nft_id': intent_request['nft_id'],
+                'category_id': intent_request['category_id'],
+                'status': GiftDeliveryStatus.PENDING.value,
+                'attempts': 0,
+                'created_at': now,
+                'next_attempt_at': now
+            }},
+            upsert=True
+        )
+
+        self._new_records.set()
+
+    async def claim(self, leased_until: datetime.datetime | None = None
+                    ) -> dict | None:
+        """Take the next due delivery and lease it to the caller.
+
+        :param leased_until: End of the lease, `lease_seconds` from now
+         by default
+        """
+
+        now = datetime.datetime.utcnow()
+        leased_until = leased_until or now + datetime.timedelta(
+            seconds=self.lease_seconds)
+
+        while record := await self.db.gift_outbox.find_one_and_update(
+                filter={'$and': [{'status': GiftDeliveryStatus.PENDING.value},
+                                 {'next_attempt_at': {'$lte': now}}]},
+                update={'$set': {'next_attempt_at': leased_until,
+                                 'lease_id': uuid.uuid4().hex},
+                        '$inc': {'attempts': 1}},
+                sort=[('next_attempt_at', ASCENDING)],
+                return_document=ReturnDocument.AFTER):
+
+            # The lease of the last attempt has expired
+            if record['attempts'] > self.max_attempts:
+                self.logger.warning(
+                    'Gifts delivery for intent request #%s lost its lease '
+                    'on the last attempt, giving up', record['_id'],
+                    extra={'intent_id': record['_id']})
+                await self._update_leased(record, {'$set': {
+                    'status': GiftDeliveryStatus.FAILED.value,
+                    'last_error': 'Lease expired'}})
+                continue
+
+            return record
+
+        return None
+
+    async def claim_many(self, limit: int) -> list[dict]:
+        """Take up to `limit` due deliveries, leased to the caller.
+
+        All of them are leased until the same moment, so the first claimed
+        one does not expire while the rest are being claimed.
+        """
+
+        leased_until = datetime.datetime.utcnow() + datetime.timedelta(
+            seconds=self.lease_seconds)
+
+        records = []
+        while len(records) < limit and (record := await self.claim(
+                leased_until)):
+            records.append(record)
+        return records
+
+    def lease_remaining(self, records: list[dict]) -> float:
+        """Seconds until the first lease of the records expires, 0 if it
+        already has.
+        """
+
+        return max(0.0, (min(record['next_attempt_at'] for record in records)
+                         - datetime.datetime.utcnow()).total_seconds())
+
+    async def mark_channels_sent(self, record: dict,
+                                 channels: list[str]) -> bool:
+        """Remember channels which must not be notified again on a retry.
+
+        :return: False if the lease has been lost
+        """
+
+        return await self._update_leased(
+            record, {'$addToSet': {'sent_channels': {'$each': channels}}})
+
+    async def mark_sent(self, record: dict) -> bool:
+        """:return: False if the lease has been lost"""
+
+        return await self._update_leased(
+            record, {'$set': {'status': GiftDeliveryStatus.SENT.value,
+                              'sent_at': datetime.datetime.utcnow()}})
+
+    async def mark_failed(self, record: dict, error: Exception) -> bool:
+        """Schedule a retry with a backoff or give up after the last one.
+
+        :return: False if the lease has been lost
+        """
+
+        if record['attempts'] >= self.max_attempts:
+            update = {'status': GiftDeliveryStatus.FAILED.value}
+
+        else:
+            delay = min(self.max_backoff_seconds,
+                        self.backoff_seconds * 2 ** (record['attempts'] - 1))
+            update = {'next_attempt_at': datetime.datetime.utcnow()
+                      + datetime.timedelta(seconds=delay)}
+
+        return await self._update_leased(
+            record, {'$set': {**update, 'last_error': repr(error)}})
+
+    async def _update_leased(self, record: dict, update: dict) -> bool:
+        # Once the lease expires the record may be claimed by another
+        # worker, which is the only one allowed to update it then
+        result = await self.db.gift_outbox.update_one(
+            filter={'$and': [{'_id': record['_id']},
+                             {'lease_id': record['lease_id']}]},
+            update=update
+        )
+
+        if not result.matched_count:
+            self.logger.warning(
+                'Lease of gifts delivery for intent request #%s expired, '
+                'the result is not recorded', record['_id'],
+                extra={'intent_id': record['_id']})
+            return False
+        return True
+
+    async def wait(self, timeout: float):
+        """Wait until a record is enqueued by this process or timeout."""
+
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._new_records.wait(), timeout)
+
+        self._new_records.clear()
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from logging import Logger
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from nft.app.utils import LRUCache
+
+
+class GiftsCache:
+    """In-memory copy of the gifts catalogue keyed by (category_id, nft_id).
+
+    The catalogue is loaded in bulk and refreshed in the background once it
+    is older than `ttl` seconds, stale entries are served meanwhile.
+    After `invalidate` the next lookup waits for a fresh catalogue.
+    NFTs added after the last load are looked up in a single query.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, ttl: float,
+                 max_missing: int, logger: Logger):
+        """
+        :param db: Database object
+        :param ttl: How long the loaded catalogue is fresh in seconds
+        :param max_missing: How many NFTs without gifts we remember, the
+         ids come from clients so they are bounded
+        :param logger: Logger object
+        """
+
+        self.db = db
+        self.ttl = ttl
+        self.max_missing = max_missing
+        self.logger = logger
+
+        self.hits = 0
+        self.misses = 0
+
+        self._gifts: dict[tuple[str, str], list] = {}
+        # NFTs known to have no gifts until the next load
+        self._missing = LRUCache(max_missing)
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._refresh: asyncio.Task | None = None
+
+    async def load(self):
+        """Load the whole gifts catalogue from a database."""
+
+        async with self._lock:
+            await self._load()
+
+    async def _load(self):
+        gifts = {}
+        async for nft in self.db.gifts.find(
+                filter={}, projection={'_id': False, 'category_id': True,
+                                       'nft_id': True, 'gifts': True}):
+            gifts[(nft['category_id'], nft['nft_id'])] = nft['gifts']
+
+        self._gifts = gifts
+        self._missing.clear()
+        self._loaded_at = time.monotonic()
+
+        self.logger.info('Gifts catalogue loaded, %d NFTs have gifts',
+                         len(gifts), extra={'nfts_count': len(gifts)})
+
+    def invalidate(self):
+        """Make the next lookup wait for a freshly loaded catalogue."""
+        self._loaded_at = None
+
+    async def get(self, category_id: str, nft_id: str) -> list | None:
+        """Gifts of the NFT, None if the NFT is not in the catalogue."""
+        return (await self.get_many([(category_id, nft_id)])).get(
+            (category_id, nft_id))
+
+    async def get_many(self, nfts: list[tuple[str, str]]) -> dict[
+            tuple[str, str], list]:
+        """Gifts of the NFTs keyed by (category_id, nft_id).
+
+        NFTs which are not in the catalogue are missing in the result.
+        """
+
+        if self._loaded_at is None:
+            async with self._lock:
+                # Concurrent lookups wait for the load of the first one
+                if self._loaded_at is None:
+                    await self._load()
+
+        elif (time.monotonic() - self._loaded_at > self.ttl
+              and (self._refresh is None or self._refresh.done())):
+            self._refresh = asyncio.create_task(self.load())
+
+        unknown = {nft for nft in nfts
+                   if nft not in self._gifts and nft not in self._missing}
+        self.hits += len(nfts) - len(unknown)
+        self.misses += len(unknown)
+
+        if unknown:
+            async for nft in self.db.gifts.find(
+                    filter={'$or': [{'category_id': category_id,
+                                     'nft_id': nft_id}
+                                    for category_id, nft_id in unknown]},
+                    projection={'_id': False, 'category_id': True,
+                                'nft_id': True, 'gifts': True}):
+                self._gifts[(nft['category_id'], nft['nft_id'])] = nft['gifts']
+
+            for nft in unknown - self._gifts.keys():
+                self._missing.set(nft, True)
+
+        return {nft: self._gifts[nft] for nft in nfts if nft in self._gifts}
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._gifts),
+            'age': (time.monotonic() - self._loaded_at
+                    if self._loaded_at is not None else None)
+        }
@@ -0,0 +1,214 @@
+import asyncio
+import contextlib
+import datetime
+import time
+from logging import Logger
+from typing import Awaitable, Callable, NamedTuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from nft.app import metrics
+from nft.app.dependencies.event_scanner import EventScanner
+from nft.app.dependencies.event_scanner_state import ScannerDatabaseState
+
+
+class HealthCheck(NamedTuple):
+    healthy: bool
+    value: float | None = None
+    threshold: float | None = None
+    error: str | None = None
+    # Whether an unhealthy check fails the endpoint
+    gating: bool = True
+
+
+class HealthProber:
+    """Probe the app dependencies and the scanner in the background.
+
+    Health check endpoints only read the results of the latest probe,
+    so they never add load to Mongo or the JSON-RPC node. Only the checks
+    listed in `readiness_checks` fail readiness, the rest are reported
+    and exported as metrics.
+    """
+
+    MONGO_PING = 'mongo_ping_seconds'
+    RPC_LATENCY = 'rpc_latency_seconds'
+    SCANNER_LAG_BLOCKS = 'scanner_lag_blocks'
+    SCANNER_LAG_SECONDS = 'scanner_lag_seconds'
+    SECONDS_SINCE_CHUNK = 'seconds_since_last_chunk'
+
+    def __init__(self, db: AsyncIOMotorDatabase, scanner: EventScanner,
+                 state: ScannerDatabaseState, interval: float,
+                 timeout: float, thresholds: dict[str, float],
+                 readiness_checks: list[str], max_probe_age: float,
+                 logger: Logger):
+        """
+        :param db: Database object
+        :param scanner: Event scanner, its JSON-RPC connection is probed
+        :param state: Scanner state
+        :param interval: How often we probe
+        :param timeout: How long a single probe may take
+        :param thresholds: Check name -> the highest healthy value
+        :param readiness_checks: Names of the checks failing readiness
+        :param max_probe_age: How old the latest probe may be until
+         the app is considered stuck
+        :param logger: Logger object
+        """
+
+        self.db = db
+        self.scanner = scanner
+        self.state = state
+        self.interval = interval
+        self.timeout = timeout
+        self.thresholds = thresholds
+        self.readiness_checks = set(readiness_checks)
+        self.max_probe_age = max_probe_age
+        self.logger = logger
+
+        self.checks: dict[str, HealthCheck] = {}
+        self.probed_at: float | None = None
+
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._prober: asyncio.Task | None = None
+
+    def start(self):
+        if self._prober is None:
+            self._prober = asyncio.create_task(self._probe_forever())
+
+    async def stop(self):
+        if self._prober is not None:
+            self._prober.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._prober
+            self._prober = None
+
+    def watch_task(self, name: str, task: asyncio.Task):
+        """Report the app as dead once the background task stops."""
+        self._tasks[name] = task
+
+    def liveness(self) -> dict[str, HealthCheck]:
+        """Background tasks are running and the probes are not stuck."""
+
+        checks = {
+            f'{name}_task': HealthCheck(
+                healthy=not task.done(),
+                error=_describe_stopped(task) if task.done() else None)
+            for name, task in self._tasks.items()
+        }
+
+        probe_age = (time.monotonic() - self.probed_at
+                     if self.probed_at is not None else None)
+        checks['probe_age_seconds'] = HealthCheck(
+            # The first probe may still be running
+            healthy=probe_age is None or probe_age <= self.max_probe_age,
+            value=probe_age,
+            threshold=self.max_probe_age)
+
+        return checks
+
+    def readiness(self) -> dict[str, HealthCheck]:
+        """Results of the latest probe, not ready before the first one."""
+
+        if self.probed_at is None:
+            return {'probe': HealthCheck(healthy=False,
+                                         error='Not probed yet')}
+
+        return self.checks
+
+    async def probe(self):
+        """Run all probes concurrently and store their results."""
+
+        head_block: int | None = None
+
+        async def _rpc_latency() -> float:
+            nonlocal head_block
+            start = time.monotonic()
+            head_block = await self.scanner.web3.eth.block_number
+            return time.monotonic() - start
+
+        async def _mongo_ping() -> float:
+            start = time.monotonic()
+            await self.db.command('ping')
+            return time.monotonic() - start
+
+        async def _scanner_lag_seconds() -> float:
+            block_when = await self.scanner.get_block_when(
+                self.state.get_last_scanned_block())
+            if block_when is None:
+                raise ValueError('Last scanned block is not mined')
+            return (datetime.datetime.utcnow() - block_when).total_seconds()
+
+        rpc_latency, mongo_ping, scanner_lag_seconds = await asyncio.gather(
+            self._check(self.RPC_LATENCY, _rpc_latency),
+            self._check(self.MONGO_PING, _mongo_ping),
+            self._check(self.SCANNER_LAG_SECONDS, _scanner_lag_seconds))
+
+        checks = {self.RPC_LATENCY: rpc_latency,
+                  self.MONGO_PING: mongo_ping,
+                  self.SCANNER_LAG_SECONDS: scanner_lag_seconds}
+
+        async def _scanner_lag_blocks() -> float:
+            if head_block is None:
+                raise ValueError('Head block is unknown')
+            return head_block - self.state.get_last_scanned_block()
+
+        async def _seconds_since_chunk() -> float:
+            if self.state.last_chunk_at is None:
+                raise ValueError('No chunk has been scanned yet')
+            return time.monotonic() - self.state.last_chunk_at
+
+        checks[self.SCANNER_LAG_BLOCKS] = await self._check(
+            self.SCANNER_LAG_BLOCKS, _scanner_lag_blocks)
+        checks[self.SECONDS_SINCE_CHUNK] = await self._check(
+            self.SECONDS_SINCE_CHUNK, _seconds_since_chunk)
+
+        self.checks = {
+            name: check._replace(gating=name in self.readiness_checks)
+            for name, check in checks.items()
+        }
+        self.probed_at = time.monotonic()
+
+        for name, check in checks.items():
+            metrics.health_check_healthy.labels(name).set(int(check.healthy))
+            if check.value is not None:
+                metrics.health_check_value.labels(name).set(check.value)
+
+        if unhealthy := [name for name, check in checks.items()
+                         if not check.healthy]:
+            self.logger.warning('Health checks failed: %s',
+                                ', '.join(unhealthy),
+                                extra={'failed_checks': unhealthy})
+
+    async def _check(self, name: str,
+                     probe: Callable[[], Awaitable[float]]) -> HealthCheck:
+        threshold = self.thresholds.get(name)
+
+        try:
+            value = await asyncio.wait_for(probe(), self.timeout)
+        except asyncio.TimeoutError:
+            return HealthCheck(healthy=False, threshold=threshold,
+                               error=f'Timed out after {self.timeout} seconds')
+        except Exception as e:
+            return HealthCheck(healthy=False, threshold=threshold,
+                               error=repr(e))
+
+        return HealthCheck(
+            healthy=threshold is None or value <= threshold,
+            value=value,
+            threshold=threshold)
+
+    async def _probe_forever(self):
+        while True:
+            try:
+                await self.probe()
+            except Exception:
+                self.logger.exception('Health probe failed')
+
+            await asyncio.sleep(self.interval)
+
+
+def _describe_stopped(task: asyncio.Task) -> str:
+    if task.cancelled():
+        return 'Cancelled'
+    if (error := task.exception()) is not None:
+        return repr(error)
+    return 'Finished'
@@ -0,0 +1,83 @@
+import random
+import threading
+import time
+from logging import Logger
+
+
+class IntentIdGenerator:
+    """Snowflake-style generator of unique intent ids.
+
+    An id packs milliseconds since `EPOCH`, the worker id and a sequence
+    number within the millisecond. It fits into 53 bits, so it is exact
+    both in the contract's uint256 and in a JavaScript number on the
+    frontend. Ids are generated locally, without any database round trip.
+    """
+
+    # 2022-01-01T00:00:00Z in milliseconds, 41 bits are enough until 2091
+    EPOCH = 1640995200000
+    WORKER_ID_BITS = 5
+    SEQUENCE_BITS = 7
+
+    MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+    MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+    def __init__(self, worker_id: int | None, logger: Logger):
+        """
+        :param worker_id: Id of this replica from 0 to `MAX_WORKER_ID`,
+         random if not set
+        :param logger: Logger object
+        """
+
+        self.logger = logger
+
+        if worker_id is None:
+            worker_id = random.randint(0, self.MAX_WORKER_ID)
+        elif not 0 <= worker_id <= self.MAX_WORKER_ID:
+            raise ValueError(f'Worker id must be between 0 and '
+                             f'{self.MAX_WORKER_ID}, got {worker_id}')
+
+        self.worker_id = worker_id
+
+        self._last_timestamp = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            # Never go back in time, even if the system clock does
+            timestamp = max(self._current_timestamp(), self._last_timestamp)
+
+            if timestamp == self._last_timestamp:
+                self._sequence = (self._sequence + 1) & self.MAX_SEQUENCE
+
+                # Sequence is exhausted, borrow the next millisecond
+                # instead of waiting for it
+                if self._sequence == 0:
+                    timestamp += 1
+            else:
+                self._sequence = 0
+
+            self._last_timestamp = timestamp
+
+            return ((timestamp << (self.WORKER_ID_BITS + self.SEQUENCE_BITS))
+                    | (self.worker_id << self.SEQUENCE_BITS)
+                    | self._sequence)
+
+    def reseed(self):
+        """Switch to another random worker id.
+
+        Called when a generated id turned out to be taken, i.e. another
+        replica uses the same worker id.
+        """
+
+        with self._lock:
+            self.worker_id = random.choice(
+                [worker_id for worker_id in range(self.MAX_WORKER_ID + 1)
+                 if worker_id != self.worker_id])
+
+        self.logger.warning('Intent id worker id changed to %d',
+                            self.worker_id,
+                            extra={'worker_id': self.worker_id})
+
+    def _current_timestamp(self) -> int:
+        return time.time_ns() // 1_000_000 - self.EPOCH
@@ -0,0 +1,118 @@
+import asyncio
+import contextlib
+import json
+from logging import Logger
+
+import websockets
+
+
+class NewBlockNotifier:
+    """Wake the scanner up as soon as the node announces a new block.
+
+    Keeps an `eth_subscribe` subscription to `newHeads` over a websocket.
+    While the subscription is down, or no websocket endpoint is configured,
+    the scanner falls back to polling every `poll_interval` seconds.
+    """
+
+    def __init__(self, ws_uri: str | None, poll_interval: float,
+                 subscribed_poll_interval: float, reconnect_delay: float,
+                 logger: Logger):
+        """
+        :param ws_uri: Websocket JSON-RPC endpoint of the node, polling only
+         if empty
+        :param poll_interval: How long to wait for a new block without
+         a subscription
+        :param subscribed_poll_interval: How long to wait for a new block
+         announcement before scanning anyway
+        :param reconnect_delay: Time to sleep before resubscribing
+        :param logger: Logger object
+        """
+
+        self.ws_uri = ws_uri
+        self.poll_interval = poll_interval
+        self.subscribed_poll_interval = subscribed_poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.logger = logger
+
+        self.subscribed = False
+        # Number of the latest announced block, only while subscribed
+        self.latest_block: int | None = None
+
+        self._new_block = asyncio.Event()
+        self._listener: asyncio.Task | None = None
+
+    def start(self):
+        """Start listening to new blocks in the background."""
+
+        if self.ws_uri and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    async def wait(self) -> bool:
+        """Wait until a new block is announced or the poll interval passes.
+
+        Blocks announced while the scanner was busy wake it up immediately.
+        Returns whether a new block was announced, `latest_block` may be
+        stale otherwise: a subscription can go quiet without an error.
+        """
+
+        timeout = (self.subscribed_poll_interval if self.subscribed
+                   else self.poll_interval)
+
+        try:
+            await asyncio.wait_for(self._new_block.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        self._new_block.clear()
+        return True
+
+    async def _listen(self):
+        while True:
+            try:
+                async with websockets.connect(self.ws_uri) as ws:
+                    await self._subscribe(ws)
+
+                    async for message in ws:
+                        notification = json.loads(message)
+                        if notification.get('method') != 'eth_subscription':
+                            continue
+
+                        header = notification['params']['result']
+                        self.latest_block = int(header['number'], 16)
+                        self._new_block.set()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.logger.warning(
+                    'New blocks subscription failed with %s, resubscribing '
+                    'in %s seconds', e, self.reconnect_delay)
+
+            finally:
+                self.subscribed = False
+                self.latest_block = None
+
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _subscribe(self, ws):
+        await ws.send(json.dumps({
+            'jsonrpc': '2.0',
+            'id': 1,
+            'method': 'eth_subscribe',
+            'params': ['newHeads']
+        }))
+
+        if 'error' in (response := json.loads(await ws.recv())):
+            raise ValueError(f"eth_subscribe rejected: {response['error']}")
+
+        self.logger.info('Subscribed to new blocks, subscription %s',
+                         response['result'])
+        self.subscribed = True
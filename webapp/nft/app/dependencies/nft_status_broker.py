@@ -0,0 +1,62 @@
+import asyncio
+import contextlib
+from logging import Logger
+from typing import Iterator
+
+
+class NFTStatusBroker:
+    """In-process pub/sub of NFT conversion status changes keyed by
+    (category_id, nft_id).
+
+    Long-poll requests subscribe to an NFT and are woken up as soon as
+    its status changes. The number of parked requests is bounded by
+    `max_subscribers`, beyond that clients fall back to plain polling.
+    """
+
+    def __init__(self, max_subscribers: int, logger: Logger):
+        """
+        :param max_subscribers: How many requests may wait for status
+         changes at once
+        :param logger: Logger object
+        """
+
+        self.max_subscribers = max_subscribers
+        self.logger = logger
+
+        self.subscribers = 0
+        self._futures: dict[tuple[str, str], set[asyncio.Future]] = {}
+
+    @contextlib.contextmanager
+    def subscribe(self, category_id: str,
+                  nft_id: str) -> Iterator[asyncio.Future | None]:
+        """Subscribe to the next status change of the NFT.
+
+        Yields a future resolved with the new status, or None if there
+        are too many subscribers already.
+        """
+
+        if self.subscribers >= self.max_subscribers:
+            yield None
+            return
+
+        key = (category_id, nft_id)
+        future = asyncio.get_running_loop().create_future()
+
+        self._futures.setdefault(key, set()).add(future)
+        self.subscribers += 1
+
+        try:
+            yield future
+        finally:
+            self.subscribers -= 1
+            futures = self._futures[key]
+            futures.discard(future)
+            if not futures:
+                del self._futures[key]
+
+    def publish(self, category_id: str, nft_id: str, status: str):
+        """Wake up everyone waiting for the NFT status change."""
+
+        for future in self._futures.get((category_id, nft_id), ()):
+            if not future.done():
+                future.set_result(status)
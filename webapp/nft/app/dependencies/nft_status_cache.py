@@ -0,0 +1,106 @@
+import asyncio
+import functools
+import time
+from logging import Logger
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from nft.app.utils import LRUCache
+
+
+class NFTStatusCache:
+    """Short-lived cache of NFT conversion statuses keyed by
+    (category_id, nft_id).
+
+    Concurrent lookups of the same NFT share a single database query.
+    Entries live for `ttl` seconds and are invalidated as soon as this
+    process learns the status changed, so the TTL only bounds how long
+    other replicas' changes stay unnoticed.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, max_size: int, ttl: float,
+                 logger: Logger):
+        """
+        :param db: Database object
+        :param max_size: How many NFTs we keep, least recently used
+         are evicted
+        :param ttl: How long a status is served from the cache
+        :param logger: Logger object
+        """
+
+        self.db = db
+        self.ttl = ttl
+        self.logger = logger
+
+        self.hits = 0
+        self.misses = 0
+
+        # (category_id, nft_id) -> (status or None, expiration time)
+        self._statuses = LRUCache(max_size)
+        self._in_flight: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def get(self, category_id: str, nft_id: str) -> str | None:
+        """Status of the latest intent request for the NFT, None if
+        there are none.
+        """
+
+        key = (category_id, nft_id)
+
+        if (cached := self._statuses.get(key)) is not None:
+            status, expires_at = cached
+            if expires_at > time.monotonic():
+                self.hits += 1
+                return status
+
+        self.misses += 1
+
+        if (query := self._in_flight.get(key)) is None:
+            query = self._in_flight[key] = asyncio.create_task(
+                self._query(key))
+            query.add_done_callback(functools.partial(self._query_done, key))
+
+        # A cancelled caller must not cancel the query shared with others
+        return await asyncio.shield(query)
+
+    def invalidate(self, category_id: str, nft_id: str):
+        """Forget the status, the next lookup reads it from a database."""
+
+        key = (category_id, nft_id)
+
+        self._statuses.pop(key)
+        # A query in flight may have read the old status, the next lookup
+        # starts a new one and the result of the old one is not cached
+        self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._statuses),
+                'in_flight': len(self._in_flight)}
+
+    async def _query(self, key: tuple[str, str]) -> str | None:
+        category_id, nft_id = key
+
+        intent_request = await self.db.intent_ids.find_one(
+            filter={'$and': [{'category_id': category_id},
+                             {'nft_id': nft_id}]},
+            projection={'status': True, '_id': False},
+            sort=[('request_datetime', -1)])
+
+        status = intent_request['status'] if intent_request else None
+
+        if self._in_flight.get(key) is asyncio.current_task():
+            self._statuses.set(key, (status, time.monotonic() + self.ttl))
+
+        return status
+
+    def _query_done(self, key: tuple[str, str], query: asyncio.Task):
+        if self._in_flight.get(key) is query:
+            del self._in_flight[key]
+
+        # Every waiter may be gone, e.g. disconnected long polls. The
+        # waiters still there get the error themselves
+        if not query.cancelled() and (error := query.exception()):
+            self.logger.debug('NFT status query failed with %r', error,
+                              extra={'category_id': key[0],
+                                     'nft_id': key[1]})
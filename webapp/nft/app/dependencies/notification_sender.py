@@ -1,29 +1,211 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, NamedTuple
+
 from ml.platform.client import MLPlatformAsyncClient
 
+from nft.app import metrics
+from nft.app.utils import TokenBucket
+
+
+class NotificationChannel:
+    """Rate limit, concurrency cap and statistics of a notification channel."""
+
+    def __init__(self, name: str, rate_limit: float, burst: int,
+                 concurrency: int):
+        """
+        :param name: Channel name
+        :param rate_limit: How many notifications per second we may send
+        :param burst: How many notifications we may send at once
+        :param concurrency: How many notifications may be in flight
+        """
+
+        self.name = name
+        self._bucket = TokenBucket(rate=rate_limit, capacity=burst)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+        self.sent = 0
+        self.failures = 0
+        self.total_latency = 0.0
+
+    async def send(self, call: Callable[[], Awaitable]):
+        async with self._semaphore:
+            await self._bucket.acquire()
+
+            start = time.monotonic()
+            try:
+                result = await call()
+            except Exception:
+                self.failures += 1
+                metrics.notification_failures.labels(self.name).inc()
+                metrics.notification_send_seconds.labels(
+                    self.name, 'failure').observe(time.monotonic() - start)
+                raise
+            finally:
+                self.total_latency += time.monotonic() - start
+
+            self.sent += 1
+            metrics.notification_send_seconds.labels(
+                self.name, 'success').observe(time.monotonic() - start)
+            return result
+
+    def stats(self) -> dict:
+        calls = self.sent + self.failures
+        return {
+            'sent': self.sent,
+            'failures': self.failures,
+            'average_latency': self.total_latency / calls if calls else 0.0
+        }
+
+
+class Notification(NamedTuple):
+    nft_id: str
+    nft_category: str
+    gifts: list
+    phone: str
+    channels: tuple[str, ...]
+
 
 class NotificationSender:
-    def __init__(self, notification_name: str):
+    SMS = 'sms'
+    TELEGRAM = 'telegram'
+
+    def __init__(self, notification_name: str,
+                 sms_rate_limit: float, sms_burst: int, sms_concurrency: int,
+                 telegram_rate_limit: float, telegram_burst: int,
+                 telegram_concurrency: int,
+                 digest_notification_name: str | None = None):
+        """
+        :param notification_name: Telegram notification of a conversion
+        :param digest_notification_name: Telegram notification of
+         a batch of conversions
+        """
+
         self._notification_name = notification_name
+        self._digest_notification_name = digest_notification_name
+
+        self.channels = {
+            self.SMS: NotificationChannel(
+                self.SMS, sms_rate_limit, sms_burst, sms_concurrency),
+            self.TELEGRAM: NotificationChannel(
+                self.TELEGRAM, telegram_rate_limit, telegram_burst,
+                telegram_concurrency)
+        }
+
+    async def dispatch(self, sender: MLPlatformAsyncClient,
+                       nft_id: str, nft_category: str, gifts: list,
+                       phone: str,
+                       channels: tuple[str, ...] = (SMS, TELEGRAM)) -> dict[
+            str, Exception | None]:
+        """Send notifications over the given channels concurrently.
+
+        :return: dict(channel -> exception if sending failed, otherwise None)
+        """
+
+        calls = {
+            self.SMS: lambda: self.send_sms_converted_gifts_by_nft(
+                sender, gifts=gifts, phone=phone),
+            self.TELEGRAM: lambda: self.send_telegram_notification(
+                sender, nft_id=nft_id, nft_category=nft_category,
+                gifts=gifts, phone=phone)
+        }
+
+        results = await asyncio.gather(
+            *(calls[channel]() for channel in channels),
+            return_exceptions=True)
+
+        return {channel: result if isinstance(result, Exception) else None
+                for channel, result in zip(channels, results)}
+
+    async def send_batch(self, sender: MLPlatformAsyncClient,
+                         notifications: list[Notification]) -> list[
+            dict[str, Exception | None]]:
+        """Send notifications of many conversions at once.
+
+        SMS are sent concurrently, Telegram notifications are collapsed
+        into a single digest message for the whole batch.
+
+        :return: dict(channel -> exception if sending failed, otherwise None)
+         for every notification, in the same order
+        """
+
+        if len(notifications) == 1:
+            return [await self.dispatch(sender, *notifications[0])]
+
+        sms = [notification for notification in notifications
+               if self.SMS in notification.channels]
+        telegram = [notification for notification in notifications
+                    if self.TELEGRAM in notification.channels]
+
+        calls = [self.send_sms_converted_gifts_by_nft(
+            sender, gifts=notification.gifts, phone=notification.phone)
+            for notification in sms]
+        if telegram:
+            calls.append(self.send_telegram_digest(sender, telegram))
+
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        sms_errors = {id(notification): result for notification, result
+                      in zip(sms, results)}
+        telegram_error = results[-1] if telegram else None
+
+        batch_results = []
+        for notification in notifications:
+            channel_results = {}
+            if self.SMS in notification.channels:
+                channel_results[self.SMS] = sms_errors[id(notification)]
+            if self.TELEGRAM in notification.channels:
+                channel_results[self.TELEGRAM] = telegram_error
+
+            batch_results.append(
+                {channel: error if isinstance(error, Exception) else None
+                 for channel, error in channel_results.items()})
+
+        return batch_results
+
+    async def send_telegram_digest(self, sender: MLPlatformAsyncClient,
+                                   batch: list[Notification]):
+        return await self.channels[self.TELEGRAM].send(
+            lambda: sender.post_notification(
+                notification_type=self._digest_notification_name,
+                metadata={
+                    'conversions': [
+                        {
+                            'nft_id': notification.nft_id,
+                            'nft_category': notification.nft_category,
+                            'gifts': notification.gifts,
+                            'phone': notification.phone
+                        } for notification in batch
+                    ]
+                }
+            ))
 
     async def send_telegram_notification(self,
                                          sender: MLPlatformAsyncClient,
                                          nft_id: str, nft_category: str,
                                          gifts: list, phone: str):
-        return await sender.post_notification(
-            notification_type=self._notification_name,
-            metadata={
-                'nft_id': nft_id,
-                'nft_category': nft_category,
-                'gifts': gifts,
-                'phone': phone
-            }
-        )
+        return await self.channels[self.TELEGRAM].send(
+            lambda: sender.post_notification(
+                notification_type=self._notification_name,
+                metadata={
+                    'nft_id': nft_id,
+                    'nft_category': nft_category,
+                    'gifts': gifts,
+                    'phone': phone
+                }
+            ))
 
     async def send_sms_converted_gifts_by_nft(self,
                                               sender: MLPlatformAsyncClient,
                                               gifts: list, phone: str):
-        return await sender.post_sms(mobile_phone=phone,
-                                     message=self.prepare_message(gifts))
+        return await self.channels[self.SMS].send(
+            lambda: sender.post_sms(mobile_phone=phone,
+                                    message=self.prepare_message(gifts)))
+
+    def stats(self) -> dict[str, dict]:
+        """Per channel counts of sent notifications, failures and latency."""
+        return {name: channel.stats()
+                for name, channel in self.channels.items()}
 
     @staticmethod
     def prepare_message(gifts: list) -> str:
@@ -1,13 +1,27 @@
 from .statuses import IntentRequestStatus
 from .db_operations import get_nft_gifts, get_nft_status, save_intent_request
-from .conversions import get_nft_conversions_detail
-from .event_handler import check_event_and_send_gifts
+from .conversions import (InvalidCursorError, get_nft_conversions_detail,
+                          stream_nft_conversions_detail)
+from .event_handler import check_event_and_send_gifts, send_gifts
+from .gift_delivery import run_gift_delivery
+from .indexes import (CollectionScanError, IndexCreationError,
+                      ensure_indexes)
 from .scanner_actions import run_scanner
+from .status_updates import wait_nft_status, watch_nft_status_changes
 
 __all__ = ['save_intent_request',
            'get_nft_status',
            'get_nft_gifts',
            'IntentRequestStatus',
            'run_scanner',
+           'run_gift_delivery',
+           'ensure_indexes',
+           'CollectionScanError',
+           'IndexCreationError',
            'check_event_and_send_gifts',
-           'get_nft_conversions_detail']
+           'send_gifts',
+           'get_nft_conversions_detail',
+           'stream_nft_conversions_detail',
+           'InvalidCursorError',
+           'wait_nft_status',
+           'watch_nft_status_changes']
@@ -1,35 +1,129 @@
+import base64
+import binascii
+import datetime
+import json
 from logging import Logger
-from typing import Any
+from typing import Any, AsyncIterator
 
+from bson import ObjectId
+from bson.errors import InvalidId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DESCENDING
 
-from nft.app.config import settings
+from nft.app.config import runtime_config, settings
 from nft.app.internal import IntentRequestStatus
 
+# Newest requests first, _id breaks ties between equal datetimes
+CONVERSIONS_SORT = [('request_datetime', DESCENDING), ('_id', DESCENDING)]
+CONVERSIONS_PROJECTION = {'category_id': True, 'nft_id': True,
+                          'status': True, 'request_datetime': True}
+# Returned instead of an empty list of conversions
+NO_CONVERSIONS = {'status': 'Не было попытки конвертации'}
+
+
+class InvalidCursorError(ValueError):
+    """The cursor is not a `next_cursor` of a conversions page."""
+
 
 async def get_nft_conversions_detail(
-        phone: str, db: AsyncIOMotorDatabase,
-        logger: Logger) -> dict[str, list[dict[str, Any]]]:
-    intent_requests = []
+        phone: str, db: AsyncIOMotorDatabase, logger: Logger,
+        limit: int, cursor: str | None = None) -> dict[str, Any]:
+    """Get a page of conversions made with the phone number.
+
+    :param limit: Page size
+    :param cursor: `next_cursor` of the previous page, first page if None
+    :return: dict(conversions, next_cursor), next_cursor is None on the
+     last page
+    """
+
+    # One extra document tells whether there is a next page
+    intent_requests = await db.intent_ids.find(
+        filter=_build_filter(phone, cursor),
+        projection=CONVERSIONS_PROJECTION,
+        sort=CONVERSIONS_SORT,
+        limit=limit + 1).to_list(None)
+
+    next_cursor = (_encode_cursor(intent_requests[limit - 1])
+                   if len(intent_requests) > limit else None)
+
+    conversions = [_get_conversion_detail(intent_request)
+                   for intent_request in intent_requests[:limit]]
+
+    if not conversions and cursor is None:
+        conversions.append(NO_CONVERSIONS)
+
+    return {'conversions': conversions, 'next_cursor': next_cursor}
+
+
+def stream_nft_conversions_detail(
+        phone: str, db: AsyncIOMotorDatabase, logger: Logger,
+        cursor: str | None = None) -> AsyncIterator[str]:
+    """Stream all conversions made with the phone number as NDJSON lines.
+
+    The filter is built, and the cursor validated, before the stream
+    starts, so an invalid cursor is reported instead of a broken stream.
+    """
+
+    query_filter = _build_filter(phone, cursor)
 
+    async def _stream():
+        empty = True
+
+        async for intent_request in db.intent_ids.find(
+                filter=query_filter,
+                projection=CONVERSIONS_PROJECTION,
+                sort=CONVERSIONS_SORT,
+                batch_size=settings.CALL_CENTER_STREAM_BATCH_SIZE):
+            empty = False
+            yield json.dumps(_get_conversion_detail(intent_request),
+                             ensure_ascii=False) + '\n'
+
+        if empty and cursor is None:
+            yield json.dumps(NO_CONVERSIONS, ensure_ascii=False) + '\n'
+
+    return _stream()
+
+
+def _build_filter(phone: str, cursor: str | None) -> dict:
     if not phone.startswith('+'):
         phone = f'+{phone}'
 
-    async for intent_request in db.intent_ids.find(
-            filter={'phone': phone}):
-        intent_requests.append(
-            {
-                'collection': settings.as_dict().get(
-                    'NFT_CATEGORY_MAP').get(intent_request['category_id']),
-                'nft_id': intent_request['nft_id'],
-                'status': _get_status(intent_request['status'])
-            }
-        )
-
-    if not intent_requests:
-        intent_requests.append({'status': 'Не было попытки конвертации'})
-
-    return {'conversions': intent_requests}
+    if cursor is None:
+        return {'phone': phone}
+
+    request_datetime, intent_request_id = _decode_cursor(cursor)
+
+    return {'$and': [
+        {'phone': phone},
+        {'$or': [{'request_datetime': {'$lt': request_datetime}},
+                 {'request_datetime': request_datetime,
+                  '_id': {'$lt': intent_request_id}}]}
+    ]}
+
+
+def _encode_cursor(intent_request: dict) -> str:
+    cursor = json.dumps([intent_request['request_datetime'].isoformat(),
+                         str(intent_request['_id'])])
+    return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime.datetime, ObjectId]:
+    try:
+        request_datetime, intent_request_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode()))
+        return (datetime.datetime.fromisoformat(request_datetime),
+                ObjectId(intent_request_id))
+    except (binascii.Error, InvalidId, TypeError, ValueError) as e:
+        raise InvalidCursorError('Invalid cursor') from e
+
+
+def _get_conversion_detail(intent_request: dict) -> dict[str, Any]:
+    return {
+        'collection': runtime_config.nft_category_map.get(
+            intent_request['category_id']),
+        'nft_id': intent_request['nft_id'],
+        'status': _get_status(intent_request['status'])
+    }
 
 
 def _get_status(status: str) -> str:
@@ -1,64 +1,83 @@
-import uuid
 from datetime import datetime
 from logging import Logger
 
 import pytz
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
 
 from nft.app.config import settings
+from nft.app.dependencies import GiftsCache, IntentIdGenerator, NFTStatusCache
 from nft.app.internal import IntentRequestStatus
 from nft.app.schemas import NFTConversionRequest, NFTIdsRequest
 
 
 async def save_intent_request(db: AsyncIOMotorDatabase,
+                              intent_id_generator: IntentIdGenerator,
+                              nft_status_cache: NFTStatusCache,
                               intent_request_data: NFTConversionRequest,
                               logger: Logger):
-    rand = ''.join(c for c in str(uuid.uuid4()) if c.isnumeric())
-    intent_request_id = int(f'{rand[:3]}{rand[4:7]}{rand[9:12]}')
+    document = {
+        'category_id': intent_request_data.category_id,
+        'nft_id': intent_request_data.nft_id,
+        'phone': intent_request_data.phone,
+        'request_datetime': datetime.now(pytz.timezone(settings.MSK_TZ)),
+        'status': IntentRequestStatus.PENDING.value
+    }
 
-    await db.intent_ids.insert_one(
-        document={
-            'intent_id': intent_request_id,
-            'category_id': intent_request_data.category_id,
-            'nft_id': intent_request_data.nft_id,
-            'phone': intent_request_data.phone,
-            'request_datetime': datetime.now(
-                pytz.timezone(settings.MSK_TZ)),
-            'status': IntentRequestStatus.PENDING.value
-        })
+    for attempt in range(settings.INTENT_ID_MAX_ATTEMPTS):
+        intent_request_id = intent_id_generator.next_id()
 
-    print(f'Intent request #{intent_request_id} processed')
+        try:
+            # Unique index on intent_id guarantees uniqueness across
+            # replicas, a fresh document gets a fresh `_id` on a retry
+            await db.intent_ids.insert_one(
+                document={**document, 'intent_id': intent_request_id})
+            break
+        except DuplicateKeyError:
+            logger.warning('Intent id #%d is already taken',
+                           intent_request_id,
+                           extra={'intent_id': intent_request_id})
+            # Another replica generates ids with the same worker id
+            intent_id_generator.reseed()
+    else:
+        raise RuntimeError(f'Failed to allocate an intent id in '
+                           f'{settings.INTENT_ID_MAX_ATTEMPTS} attempts')
+
+    # The new request is the latest one for the NFT now
+    nft_status_cache.invalidate(intent_request_data.category_id,
+                                intent_request_data.nft_id)
+
+    logger.info('Intent request #%d processed', intent_request_id,
+                extra={'intent_id': intent_request_id,
+                       'category_id': intent_request_data.category_id,
+                       'nft_id': intent_request_data.nft_id})
     return {'intent_id': intent_request_id}
 
 
-async def get_nft_gifts(db: AsyncIOMotorDatabase, ids: NFTIdsRequest,
+async def get_nft_gifts(gifts_cache: GiftsCache, ids: NFTIdsRequest,
                         logger: Logger):
-    gifts_list = []
-
-    for nft_path in ids.nft_ids:
-        nft: dict | None = await db.gifts.find_one(
-            filter={'$and': [{'category_id': nft_path.category_id},
-                             {'nft_id': nft_path.nft_id}]})
+    nft_gifts = await gifts_cache.get_many(
+        [(nft_path.category_id, nft_path.nft_id) for nft_path in ids.nft_ids])
 
-        gifts_list.append(
-            {
-                'category_id': nft_path.category_id,
-                'nft_id': nft_path.nft_id,
-                'gifts': nft['gifts'] if nft else []
-            }
-        )
+    # Keep the order of the request
+    gifts_list = [
+        {
+            'category_id': nft_path.category_id,
+            'nft_id': nft_path.nft_id,
+            'gifts': nft_gifts.get((nft_path.category_id, nft_path.nft_id), [])
+        } for nft_path in ids.nft_ids
+    ]
 
-    print(f'Got the following gifts for tokens: {gifts_list}')
+    logger.debug('Got gifts for %d tokens', len(gifts_list),
+                 extra={'nfts_count': len(gifts_list)})
     return {'data': gifts_list}
 
 
-async def get_nft_status(db: AsyncIOMotorDatabase,
+async def get_nft_status(nft_status_cache: NFTStatusCache,
                          category_id: str, nft_id: str, logger: Logger):
-    if not (nft := await db.intent_ids.find_one(
-            filter={'$and': [{'category_id': category_id},
-                             {'nft_id': nft_id}]},
-            sort=[('request_datetime', -1)]) or {}):
-        print(f'NFT #{nft_id} conversion status in '
-              f'collection #{category_id} not found')
+    if not (nft_status := await nft_status_cache.get(category_id, nft_id)):
+        logger.debug('NFT #%s conversion status in collection #%s not found',
+                     nft_id, category_id,
+                     extra={'category_id': category_id, 'nft_id': nft_id})
 
-    return {'status': nft.get('status') or 'Intent request not found'}
+    return {'status': nft_status or 'Intent request not found'}
@@ -3,56 +3,122 @@ from logging import Logger
 from dependency_injector.wiring import inject, Provide
 from ml.platform.client import MLPlatformAsyncClient
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo import ReturnDocument
 from web3.datastructures import AttributeDict
 
-from nft.app.config import settings
+from nft.app.config import runtime_config
 from nft.app.containers import Container
-from nft.app.dependencies import NotificationSender
+from nft.app.dependencies import (GiftOutbox, GiftsCache, Notification,
+                                  NFTStatusBroker, NFTStatusCache,
+                                  NotificationSender)
 from nft.app.internal import IntentRequestStatus
 
 
 @inject
 async def check_event_and_send_gifts(
         args: AttributeDict,
-        mlp_client: MLPlatformAsyncClient = Provide[
-            Container.mlp_client],
-        notification_sender: NotificationSender = Provide[
-            Container.notification_sender],
+        gift_outbox: GiftOutbox = Provide[Container.gift_outbox],
+        nft_status_cache: NFTStatusCache = Provide[
+            Container.nft_status_cache],
+        nft_status_broker: NFTStatusBroker = Provide[
+            Container.nft_status_broker],
         db_manager: AsyncIOMotorDatabase = Provide[
             Container.db_manager],
         logger: Logger = Provide[Container.logger]):
 
-    intent_request: dict | None = await db_manager.intent_ids.find_one_and_update(
+    intent_request: dict | None = await db_manager.intent_ids.find_one(
         filter={'$and': [{'intent_id': args['presentIntent']},
                          {'nft_id': str(args['tokenTokenIdInLevel'])},
-                         {'category_id': str(args['level'])}]},
-        update={'$set': {'status': IntentRequestStatus.COMPLETED.value}},
-        return_document=ReturnDocument.AFTER
+                         {'category_id': str(args['level'])}]}
     )
 
     if intent_request:
-        print(f'Intent request #{intent_request["intent_id"]} status '
-              f'changed to "{intent_request["status"]}"')
-
-        nft = await db_manager.gifts.find_one(
-            filter={'$and': [{'nft_id': intent_request['nft_id']},
-                             {'category_id': intent_request['category_id']}]})
+        # The delivery is enqueued before the intent is completed: if we
+        # crash in between, the event is scanned again and the outbox
+        # ignores the duplicate
+        await gift_outbox.enqueue(intent_request)
 
-        await notification_sender.send_sms_converted_gifts_by_nft(
-            sender=mlp_client,
-            gifts=nft['gifts'],
-            phone=intent_request['phone']
+        await db_manager.intent_ids.update_one(
+            filter={'_id': intent_request['_id']},
+            update={'$set': {'status': IntentRequestStatus.COMPLETED.value}}
         )
+        nft_status_cache.invalidate(intent_request['category_id'],
+                                    intent_request['nft_id'])
+        nft_status_broker.publish(intent_request['category_id'],
+                                  intent_request['nft_id'],
+                                  IntentRequestStatus.COMPLETED.value)
+
+        logger.info('Intent request #%d status changed to "%s"',
+                    intent_request['intent_id'],
+                    IntentRequestStatus.COMPLETED.value,
+                    extra={'intent_id': intent_request['intent_id'],
+                           'status': IntentRequestStatus.COMPLETED.value})
 
-        print(f'NFT #{intent_request["nft_id"]} gifts sent via sms '
-              f'to phone number {intent_request["phone"]}')
 
-        await notification_sender.send_telegram_notification(
-            mlp_client,
-            nft_id=intent_request['nft_id'],
-            nft_category=settings.as_dict().get(
-                'NFT_CATEGORY_MAP').get(intent_request['category_id']),
-            gifts=nft['gifts'],
-            phone=intent_request['phone']
+@inject
+async def send_gifts(
+        deliveries: list[dict],
+        mlp_client: MLPlatformAsyncClient = Provide[
+            Container.mlp_client],
+        notification_sender: NotificationSender = Provide[
+            Container.notification_sender],
+        gift_outbox: GiftOutbox = Provide[Container.gift_outbox],
+        gifts_cache: GiftsCache = Provide[Container.gifts_cache],
+        logger: Logger = Provide[Container.logger]) -> dict[
+            int, Exception | None]:
+    """Notify about gifts of the claimed deliveries in a single batch.
+
+    :return: dict(intent id -> exception if the delivery failed,
+     otherwise None)
+    """
+
+    gifts = await gifts_cache.get_many(
+        [(delivery['category_id'], delivery['nft_id'])
+         for delivery in deliveries])
+
+    errors = {}
+    notifications = {}
+
+    for delivery in deliveries:
+        if (nft := (delivery['category_id'], delivery['nft_id'])) not in gifts:
+            errors[delivery['_id']] = LookupError(
+                f'NFT #{delivery["nft_id"]} in collection '
+                f'#{delivery["category_id"]} has no gifts')
+            continue
+
+        # Channels notified on a previous attempt are not notified again
+        channels = tuple(channel for channel in (NotificationSender.SMS,
+                                                 NotificationSender.TELEGRAM)
+                         if channel not in delivery.get('sent_channels', []))
+
+        notifications[delivery['_id']] = Notification(
+            nft_id=delivery['nft_id'],
+            nft_category=runtime_config.nft_category_map.get(
+                delivery['category_id']),
+            gifts=gifts[nft],
+            phone=delivery['phone'],
+            channels=channels
         )
+
+    results = dict(zip(notifications, await notification_sender.send_batch(
+        mlp_client, list(notifications.values()))))
+
+    for delivery in deliveries:
+        if (channel_results := results.get(delivery['_id'])) is None:
+            continue
+
+        if sent := [channel for channel, error in channel_results.items()
+                    if not error]:
+            await gift_outbox.mark_channels_sent(delivery, sent)
+
+            logger.info('NFT #%s gifts of intent request #%d sent via %s',
+                        delivery['nft_id'], delivery['_id'], ', '.join(sent),
+                        extra={'intent_id': delivery['_id'],
+                               'channels': sent})
+
+        if failed := {channel: error for channel, error
+                      in channel_results.items() if error}:
+            errors[delivery['_id']] = RuntimeError(
+                f'Sending notifications failed: {failed}')
+
+    return {delivery['_id']: errors.get(delivery['_id'])
+            for delivery in deliveries}
@@ -0,0 +1,66 @@
+import asyncio
+from logging import Logger
+
+from dependency_injector.wiring import inject, Provide
+
+from nft.app.config import settings
+from nft.app.containers import Container
+from nft.app.dependencies import GiftOutbox
+from nft.app.internal.event_handler import send_gifts
+
+
+@inject
+async def run_gift_delivery(
+        gift_outbox: GiftOutbox = Provide[Container.gift_outbox],
+        logger: Logger = Provide[Container.logger]):
+    """Drain the gift outbox with a pool of concurrent workers."""
+
+    async def _deliver(deliveries: list[dict]):
+        # Expired while claiming, the deliveries are due again already
+        if not (lease_remaining := gift_outbox.lease_remaining(deliveries)):
+            logger.warning('Lease of %d gifts deliveries expired before '
+                           'sending', len(deliveries),
+                           extra={'deliveries_count': len(deliveries)})
+            return
+
+        try:
+            # Past the lease another worker may claim the deliveries and
+            # send the gifts again
+            results = await asyncio.wait_for(send_gifts(deliveries),
+                                             lease_remaining)
+        except Exception as e:
+            results = {delivery['_id']: e for delivery in deliveries}
+
+        marks = []
+        for delivery in deliveries:
+            if error := results[delivery['_id']]:
+                logger.warning(
+                    'Gifts delivery for intent request #%s failed with %r, '
+                    'attempt %d', delivery['_id'], error,
+                    delivery['attempts'],
+                    extra={'intent_id': delivery['_id'],
+                           'attempt': delivery['attempts']})
+                marks.append(gift_outbox.mark_failed(delivery, error))
+            else:
+                marks.append(gift_outbox.mark_sent(delivery))
+
+        await asyncio.gather(*marks)
+
+    async def _worker():
+        while True:
+            try:
+                # Every worker sends what it claims as one notification
+                # batch, a lone delivery is sent right away
+                if not (deliveries := await gift_outbox.claim_many(
+                        settings.GIFT_DELIVERY_BATCH_SIZE)):
+                    await gift_outbox.wait(settings.GIFT_DELIVERY_POLL_SECONDS)
+                    continue
+
+                await _deliver(deliveries)
+
+            except Exception:
+                logger.exception('Gifts delivery worker failed')
+                await asyncio.sleep(settings.GIFT_DELIVERY_POLL_SECONDS)
+
+    await asyncio.gather(
+        *(_worker() for _ in range(settings.GIFT_DELIVERY_WORKERS)))
@@ -0,0 +1,196 @@
+import datetime
+from logging import Logger
+
+from dependency_injector.wiring import inject, Provide
+from motor.motor_asyncio import (AsyncIOMotorCollection,
+                                 AsyncIOMotorDatabase)
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from nft.app.config import settings
+from nft.app.containers import Container
+from nft.app.dependencies import GiftDeliveryStatus
+from nft.app.internal import IntentRequestStatus
+
+# Indexes backing the hot queries, by collection
+INDEXES: dict[str, list[IndexModel]] = {
+    'intent_ids': [
+        IndexModel([('intent_id', ASCENDING)], name='intent_id',
+                   unique=True),
+        IndexModel([('category_id', ASCENDING), ('nft_id', ASCENDING),
+                    ('request_datetime', DESCENDING)],
+                   name='category_id_nft_id_request_datetime'),
+        IndexModel([('phone', ASCENDING), ('request_datetime', DESCENDING),
+                    ('_id', DESCENDING)],
+                   name='phone_request_datetime_id')
+    ],
+    'gifts': [
+        IndexModel([('category_id', ASCENDING), ('nft_id', ASCENDING)],
+                   name='category_id_nft_id')
+    ],
+    'gift_outbox': [
+        IndexModel([('status', ASCENDING), ('next_attempt_at', ASCENDING)],
+                   name='status_next_attempt_at')
+    ],
+    'scanned_events': [
+        IndexModel([('block_number', ASCENDING)], name='block_number')
+    ]
+}
+
+# Shapes of the hot queries: name -> (collection, filter, sort)
+HOT_QUERIES: dict[str, tuple[str, dict, dict | None]] = {
+    'scanner completed intents': (
+        'intent_ids',
+        {'$and': [{'intent_id': {'$in': [0]}},
+                  {'status': IntentRequestStatus.COMPLETED.value}]},
+        None),
+    'event handler intent': (
+        'intent_ids',
+        {'$and': [{'intent_id': 0}, {'nft_id': '0'}, {'category_id': '0'}]},
+        None),
+    'nft conversion status': (
+        'intent_ids',
+        {'$and': [{'category_id': '0'}, {'nft_id': '0'}]},
+        {'request_datetime': -1}),
+    'call center conversions': (
+        'intent_ids',
+        {'phone': '+0'},
+        {'request_datetime': -1, '_id': -1}),
+    'nft gifts': (
+        'gifts',
+        {'$or': [{'category_id': '0', 'nft_id': '0'}]},
+        None),
+    'gift outbox claim': (
+        'gift_outbox',
+        {'$and': [{'status': GiftDeliveryStatus.PENDING.value},
+                  {'next_attempt_at': {'$lte': datetime.datetime.utcnow()}}]},
+        {'next_attempt_at': 1}),
+    'forked events purge': (
+        'scanned_events',
+        {'block_number': {'$gte': 0}},
+        None)
+}
+
+
+# How many duplicated values are reported for a unique index
+MAX_REPORTED_CONFLICTS = 100
+
+
+class CollectionScanError(Exception):
+    """A hot query is not served by an index."""
+
+
+class IndexCreationError(Exception):
+    """Indexes of some collections could not be created."""
+
+
+@inject
+async def ensure_indexes(
+        db: AsyncIOMotorDatabase = Provide[Container.db_manager],
+        logger: Logger = Provide[Container.logger]):
+    """Create missing indexes and check the hot queries use them.
+
+    Existing indexes are left untouched. Indexes of every collection are
+    created independently, `IndexCreationError` is raised once all of them
+    were tried. A unique index is not built while documents duplicate its
+    keys, those are reported instead. Raises `CollectionScanError` if
+    a hot query falls back to a collection scan and `FAIL_ON_COLLSCAN`
+    is set.
+    """
+
+    failed = []
+
+    for collection, indexes in INDEXES.items():
+        try:
+            if conflicts := await find_unique_conflicts(db[collection],
+                                                        indexes):
+                for name, duplicates in conflicts.items():
+                    logger.error(
+                        'Unique index %s of collection %s is not built, '
+                        'documents share the same keys: %s', name,
+                        collection, duplicates,
+                        extra={'collection': collection, 'index': name})
+                failed.append(collection)
+
+            # The rest of the indexes are built anyway
+            if buildable := [index for index in indexes
+                             if index.document['name'] not in conflicts]:
+                await db[collection].create_indexes(buildable)
+        except PyMongoError:
+            logger.exception('Failed to create indexes of collection %s',
+                             collection, extra={'collection': collection})
+            failed.append(collection)
+        else:
+            if collection not in failed:
+                logger.info('Indexes of collection %s are ensured',
+                            collection)
+
+    if failed:
+        raise IndexCreationError(
+            f'Failed to create indexes of collections {failed}')
+
+    if collection_scans := await find_collection_scans(db):
+        if settings.FAIL_ON_COLLSCAN:
+            raise CollectionScanError(
+                f'Hot queries use a collection scan: {collection_scans}')
+        logger.warning('Hot queries use a collection scan: %s',
+                       collection_scans)
+
+
+async def find_unique_conflicts(collection: AsyncIOMotorCollection,
+                                indexes: list[IndexModel]) -> dict[
+        str, list[dict]]:
+    """Keys duplicated by documents, by names of unique indexes not built
+    yet. At most `MAX_REPORTED_CONFLICTS` keys are reported per index.
+    """
+
+    existing = await collection.index_information()
+    conflicts = {}
+
+    for index in indexes:
+        if (not index.document.get('unique')
+                or (name := index.document['name']) in existing):
+            continue
+
+        keys = {key: f'${key}' for key in index.document['key']}
+        if duplicates := [
+            group['_id'] async for group in collection.aggregate([
+                {'$group': {'_id': keys, 'count': {'$sum': 1}}},
+                {'$match': {'count': {'$gt': 1}}},
+                {'$limit': MAX_REPORTED_CONFLICTS}
+            ], allowDiskUse=True)
+        ]:
+            conflicts[name] = duplicates
+
+    return conflicts
+
+
+async def find_collection_scans(db: AsyncIOMotorDatabase) -> list[str]:
+    """Names of the hot queries whose winning plan is a collection scan."""
+
+    collection_scans = []
+
+    for name, (collection, query_filter, sort) in HOT_QUERIES.items():
+        find = {'find': collection, 'filter': query_filter}
+        if sort:
+            find['sort'] = sort
+
+        explain = await db.command({'explain': find,
+                                    'verbosity': 'queryPlanner'})
+
+        if _has_stage(explain['queryPlanner']['winningPlan'], 'COLLSCAN'):
+            collection_scans.append(name)
+
+    return collection_scans
+
+
+def _has_stage(plan: dict, stage: str) -> bool:
+    # Query plans are trees, e.g. FETCH over IXSCAN or OR over its branches
+    if plan.get('stage') == stage:
+        return True
+
+    children = [plan[key] for key in ('inputStage', 'queryPlan')
+                if key in plan]
+    children += plan.get('inputStages', [])
+
+    return any(_has_stage(child, stage) for child in children)
@@ -1,43 +1,100 @@
-import asyncio
 import time
 from logging import Logger
 
 from dependency_injector.wiring import inject, Provide
 
+from nft.app import metrics
 from nft.app.config import settings
 from nft.app.containers import Container
-from nft.app.dependencies import EventScanner, ScannerDatabaseState
+from nft.app.dependencies import (EventScanner, NewBlockNotifier,
+                                  ScannerDatabaseState)
 
 
 @inject
 async def run_scanner(state: ScannerDatabaseState = Provide[Container.state],
                       scanner: EventScanner = Provide[Container.scanner],
+                      block_notifier: NewBlockNotifier = Provide[
+                          Container.block_notifier],
                       logger: Logger = Provide[Container.logger]):
+    block_notifier.start()
+
+    # The in-memory state is authoritative, the database is only read
+    # at startup and after a failure
+    restore_needed = True
+    # Whether the cycle was woken up by a new block announcement
+    announced = False
+
     while True:
         try:
-            await state.restore()
-
-            scanner.delete_potentially_forked_block_data(
-                state.get_last_scanned_block() - settings.CHAIN_REORG_SAFETY_BLOCKS)
+            if restore_needed:
+                await state.restore()
+                restore_needed = False
 
             start_block = max(
                 state.get_last_scanned_block() - settings.CHAIN_REORG_SAFETY_BLOCKS, settings.START_BLOCK)
-            end_block = await scanner.get_suggested_scan_end_block()
 
-            print(f"Scanning events from blocks {start_block} - {end_block}")
+            # Only the blocks fetched again are purged, their events are
+            # stored again by the scan. Costs nothing unless events were
+            # stored in the rescanned blocks
+            await scanner.delete_potentially_forked_block_data(start_block)
+
+            # The announced head saves a `block_number` call per cycle.
+            # Without a fresh announcement the subscription may have gone
+            # quiet, the node is asked for the head then
+            if (announced and block_notifier.subscribed
+                    and block_notifier.latest_block):
+                end_block = block_notifier.latest_block - 1
+            else:
+                end_block = await scanner.get_suggested_scan_end_block()
+
+            logger.debug('Scanning events from blocks %d - %d', start_block,
+                         end_block)
+
+            last_scanned_block = state.get_last_scanned_block()
+            metrics.scanner_head_block.set(end_block)
+            metrics.scanner_lag_blocks.set(end_block - last_scanned_block)
 
             start = time.time()
 
-            result, total_chunks_scanned = await scanner.scan(start_block, end_block)
+            # Steady state, only a few blocks were mined since the last cycle
+            if end_block - start_block < settings.TAIL_MAX_BLOCKS:
+                result, total_chunks_scanned = await scanner.tail(
+                    start_block, end_block)
 
-            await state.save()
+            # Cold start or a long downtime, split the range across workers
+            elif (settings.BACKFILL_WORKERS > 1
+                    and end_block - start_block > settings.BACKFILL_MIN_BLOCKS):
+                result, total_chunks_scanned = await scanner.backfill(
+                    start_block, end_block)
+            else:
+                result, total_chunks_scanned = await scanner.scan(
+                    start_block, end_block)
+
+            if total_chunks_scanned > 1:
+                await state.save()
 
             duration = time.time() - start
 
-            print(
-                f"Scanned total {len(result)} PresentIntent events, in {duration} "
-                f"seconds, total {total_chunks_scanned} chunk scans performed")
-        except Exception as e:
-            print(e)
+            metrics.scanner_lag_blocks.set(
+                end_block - state.get_last_scanned_block())
+            if duration > 0:
+                metrics.scanner_blocks_per_second.set(
+                    max(0, state.get_last_scanned_block()
+                        - last_scanned_block) / duration)
+
+            logger.info(
+                'Scanned total %d PresentIntent events from blocks %d - %d '
+                'in %.3f seconds, total %d chunk scans performed',
+                len(result), start_block, end_block, duration,
+                total_chunks_scanned,
+                extra={'start_block': start_block,
+                       'end_block': end_block,
+                       'events_count': len(result),
+                       'chunks_count': total_chunks_scanned,
+                       'duration': duration})
+        except Exception:
+            metrics.scanner_cycle_failures.inc()
+            logger.exception('Scan cycle failed, restoring the state')
+            restore_needed = True
 
-        await asyncio.sleep(settings.SCAN_DELAY)
+        announced = await block_notifier.wait()
@@ -0,0 +1,87 @@
+import asyncio
+import contextlib
+from logging import Logger
+
+from dependency_injector.wiring import inject, Provide
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from nft.app.config import settings
+from nft.app.containers import Container
+from nft.app.dependencies import NFTStatusBroker, NFTStatusCache
+
+
+async def wait_nft_status(nft_status_cache: NFTStatusCache,
+                          nft_status_broker: NFTStatusBroker,
+                          category_id: str, nft_id: str,
+                          known_status: str | None, timeout: float,
+                          logger: Logger):
+    """Answer once the NFT status differs from `known_status` or after
+    `timeout` seconds, whichever comes first.
+    """
+
+    # Subscribe before reading the status, so a change in between
+    # is not missed
+    with nft_status_broker.subscribe(category_id, nft_id) as update:
+        nft_status = _describe(await nft_status_cache.get(category_id,
+                                                          nft_id))
+
+        if nft_status == known_status and update is not None:
+            with contextlib.suppress(asyncio.TimeoutError):
+                nft_status = await asyncio.wait_for(update, timeout)
+
+    return {'status': nft_status}
+
+
+@inject
+async def watch_nft_status_changes(
+        nft_status_broker: NFTStatusBroker = Provide[
+            Container.nft_status_broker],
+        nft_status_cache: NFTStatusCache = Provide[
+            Container.nft_status_cache],
+        db_manager: AsyncIOMotorDatabase = Provide[Container.db_manager],
+        logger: Logger = Provide[Container.logger]):
+    """Publish status changes made by any replica.
+
+    Follows a change stream on intent_ids, which needs a replica set.
+    """
+
+    pipeline = [{'$match': {
+        'operationType': 'update',
+        'updateDescription.updatedFields.status': {'$exists': True}}}]
+    resume_token = None
+
+    while True:
+        try:
+            async with db_manager.intent_ids.watch(
+                    pipeline, full_document='updateLookup',
+                    resume_after=resume_token) as stream:
+                logger.info('Watching intent request status changes')
+
+                async for change in stream:
+                    resume_token = stream.resume_token
+
+                    # The request was deleted since
+                    if not (intent_request := change.get('fullDocument')):
+                        continue
+
+                    category_id = intent_request['category_id']
+                    nft_id = intent_request['nft_id']
+
+                    nft_status_cache.invalidate(category_id, nft_id)
+                    nft_status_broker.publish(
+                        category_id, nft_id,
+                        change['updateDescription']['updatedFields']['status'])
+
+        except Exception as e:
+            # Errors motor could resume from are retried by motor itself,
+            # e.g. the token may be gone from the oplog, so start afresh
+            resume_token = None
+            logger.warning(
+                'Intent request status change stream failed with %s, '
+                'reconnecting in %s seconds', e,
+                settings.CHANGE_STREAM_RECONNECT_DELAY)
+            await asyncio.sleep(settings.CHANGE_STREAM_RECONNECT_DELAY)
+
+
+def _describe(nft_status: str | None) -> str:
+    return nft_status or 'Intent request not found'
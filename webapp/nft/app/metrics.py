@@ -0,0 +1,96 @@
+from pymongo import monitoring
+
+from nft.app.utils import MetricsRegistry
+
+registry = MetricsRegistry()
+
+# Scanner
+scanner_blocks_scanned = registry.counter(
+    'nft_scanner_blocks_scanned_total',
+    'Blocks scanned for events, rate() gives blocks per second')
+scanner_blocks_per_second = registry.gauge(
+    'nft_scanner_blocks_per_second',
+    'Scan speed of the last scan cycle')
+scanner_events_processed = registry.counter(
+    'nft_scanner_events_processed_total',
+    'PresentIntent events processed')
+scanner_head_block = registry.gauge(
+    'nft_scanner_head_block',
+    'Latest block the scanner may scan up to')
+scanner_last_scanned_block = registry.gauge(
+    'nft_scanner_last_scanned_block',
+    'Last block the scanner has completed')
+scanner_lag_blocks = registry.gauge(
+    'nft_scanner_lag_blocks',
+    'How many blocks the scanner is behind the head')
+scanner_chunk_size = registry.gauge(
+    'nft_scanner_chunk_size',
+    'Block range of the next eth_getLogs call')
+scanner_get_logs_seconds = registry.histogram(
+    'nft_scanner_get_logs_seconds',
+    'Latency of eth_getLogs calls', ['result'])
+scanner_get_logs_retries = registry.counter(
+    'nft_scanner_get_logs_retries_total',
+    'Retried eth_getLogs calls')
+scanner_backfill_block = registry.gauge(
+    'nft_scanner_backfill_block',
+    'Last block a backfill worker has fetched and processed', ['worker'])
+scanner_backfill_range_end = registry.gauge(
+    'nft_scanner_backfill_range_end',
+    'Last block of the range a backfill worker is scanning', ['worker'])
+scanner_cycle_failures = registry.counter(
+    'nft_scanner_cycle_failures_total',
+    'Scan cycles which failed')
+
+# Health
+health_check_value = registry.gauge(
+    'nft_health_check_value',
+    'Value measured by the latest health probe', ['check'])
+health_check_healthy = registry.gauge(
+    'nft_health_check_healthy',
+    'Whether the latest health probe is within its threshold', ['check'])
+
+# API
+http_request_seconds = registry.histogram(
+    'nft_http_request_duration_seconds',
+    'Latency of HTTP requests', ['method', 'route', 'status'])
+
+# Database
+mongo_command_seconds = registry.histogram(
+    'nft_mongo_command_duration_seconds',
+    'Latency of Mongo commands', ['command', 'result'])
+
+# Notifications
+notification_send_seconds = registry.histogram(
+    'nft_notification_send_seconds',
+    'Latency of sent notifications', ['channel', 'result'])
+notification_failures = registry.counter(
+    'nft_notification_failures_total',
+    'Notifications which failed to send', ['channel'])
+
+# Caches, filled in on scrape. Hits and misses are counted by the caches
+# since the start, so they are exported as counters
+cache_hits = registry.counter(
+    'nft_cache_hits_total', 'Lookups served from a cache', ['cache'])
+cache_misses = registry.counter(
+    'nft_cache_misses_total', 'Lookups a cache could not serve', ['cache'])
+cache_size = registry.gauge(
+    'nft_cache_size', 'Entries kept in a cache', ['cache'])
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Time every command the driver sends to Mongo.
+
+    Called from driver threads, the metrics are thread-safe.
+    """
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        mongo_command_seconds.labels(event.command_name, 'success').observe(
+            event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        mongo_command_seconds.labels(event.command_name, 'failure').observe(
+            event.duration_micros / 1e6)
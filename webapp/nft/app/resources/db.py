@@ -1,10 +1,13 @@
 from dependency_injector import resources
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
+from nft.app.metrics import MongoCommandMetrics
+
 
 class DbManagerResource(resources.Resource):
     def init(self, host: str, ca_file: str) -> AsyncIOMotorDatabase:
         client = AsyncIOMotorClient(host,
                                     tlsCAFile=ca_file,
-                                    tlsAllowInvalidCertificates=False)
+                                    tlsAllowInvalidCertificates=False,
+                                    event_listeners=[MongoCommandMetrics()])
         return client.nft_backend
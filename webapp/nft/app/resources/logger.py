@@ -1,4 +1,6 @@
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from dependency_injector import resources
 from ml.common.elk_logstash_logging.handler import get_elk_logstash_handler
@@ -13,6 +15,22 @@ class LoggerResource(resources.Resource):
             logstash_host=logstash_host,
             logstash_port=logstash_port
         )
-        logger.addHandler(handler)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+        # Handlers write to the network and stdout in a separate thread,
+        # the event loop only puts records to the queue
+        log_queue = queue.SimpleQueue()
+        self.queue_handler = QueueHandler(log_queue)
+        self.listener = QueueListener(log_queue, handler, stream_handler,
+                                      respect_handler_level=True)
+        self.listener.start()
+        logger.addHandler(self.queue_handler)
 
         return logger
+
+    def shutdown(self, logger: logging.Logger):
+        # Flushes records still in the queue
+        logger.removeHandler(self.queue_handler)
+        self.listener.stop()
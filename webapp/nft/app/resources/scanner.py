@@ -7,12 +7,16 @@ from web3.eth import AsyncEth
 from web3.middleware import async_geth_poa_middleware
 
 from nft.app.config import settings
-from nft.app.dependencies import EventScanner
-from nft.app.utils import EventScannerState
+from nft.app.dependencies import (AIMDChunkSizeController,
+                                  BlockTimestampBatchFetcher, EventScanner,
+                                  HitMissChunkSizeController, NFTStatusCache)
+from nft.app.utils import ChunkSizeController, EventScannerState
 
 
 class EventScannerResource(resources.Resource):
-    def init(self, state: EventScannerState, logger: Logger) -> EventScanner:
+    def init(self, state: EventScannerState,
+             nft_status_cache: NFTStatusCache,
+             logger: Logger) -> EventScanner:
         provider = AsyncHTTPProvider(settings.BLOCKCHAIN_ADDRESS)
 
         web3 = Web3(provider,
@@ -24,11 +28,52 @@ class EventScannerResource(resources.Resource):
 
         contract = web3.eth.contract(abi=abi)
 
+        block_fetcher = None
+        if settings.RPC_BATCH_ENABLED:
+            block_fetcher = BlockTimestampBatchFetcher(
+                endpoint_uri=settings.BLOCKCHAIN_ADDRESS,
+                max_batch_size=settings.RPC_BATCH_MAX_SIZE,
+                concurrency=settings.BLOCK_TIMESTAMP_CONCURRENCY,
+                timeout=settings.RPC_REQUEST_TIMEOUT,
+                retries=settings.RPC_REQUEST_RETRIES,
+                retry_delay=settings.REQUEST_RETRY_MIN_SECONDS,
+                max_retry_delay=settings.REQUEST_RETRY_SECONDS,
+                logger=logger
+            )
+
         return EventScanner(
             web3=web3,
             contract=contract,
             state=state,
             events=[contract.events.PresentIntent],
             filters={'address': settings.CONTRACT_ADDRESS},
-            logger=logger
+            logger=logger,
+            block_fetcher=block_fetcher,
+            nft_status_cache=nft_status_cache,
+            chunk_size_controller=_get_chunk_size_controller(
+                settings.CHUNK_SIZE_CONTROLLER)
         )
+
+
+def _get_chunk_size_controller(name: str) -> ChunkSizeController:
+    match name:
+        case 'hit_miss':
+            return HitMissChunkSizeController(
+                min_chunk_size=settings.MIN_SCAN_CHUNK_SIZE,
+                max_chunk_size=settings.MAX_SCAN_CHUNK_SIZE,
+                increase_factor=settings.CHUNK_SIZE_INCREASE,
+                decrease_factor=settings.CHUNK_SIZE_DECREASE
+            )
+
+        case 'aimd':
+            return AIMDChunkSizeController(
+                min_chunk_size=settings.MIN_SCAN_CHUNK_SIZE,
+                max_chunk_size=settings.MAX_SCAN_CHUNK_SIZE,
+                increase_step=settings.CHUNK_SIZE_INCREASE_STEP,
+                decrease_factor=settings.CHUNK_SIZE_DECREASE,
+                target_scan_seconds=settings.CHUNK_TARGET_SCAN_SECONDS,
+                max_logs=settings.CHUNK_MAX_LOGS
+            )
+
+        case _:
+            raise ValueError(f'Unknown chunk size controller "{name}"')
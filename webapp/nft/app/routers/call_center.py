@@ -1,11 +1,14 @@
 from logging import Logger
 
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from nft.app.config import settings
 from nft.app.containers import Container
-from nft.app.internal import get_nft_conversions_detail
+from nft.app.internal import (InvalidCursorError, get_nft_conversions_detail,
+                              stream_nft_conversions_detail)
 from nft.app.schemas import NFTConversionsCheckResponse, \
     InternalServerErrorResponse
 
@@ -15,12 +18,30 @@ router = APIRouter(prefix='/conversions/check',
 
 @router.get('',
             summary='Get converted NFT by phone',
-            description='Returns NFT list',
+            description='Returns a page of NFT list, newest first. '
+                        'With `stream` the whole list starting from '
+                        '`cursor` is streamed as NDJSON instead',
             response_model=NFTConversionsCheckResponse,
-            responses={500: {'model': InternalServerErrorResponse}})
+            responses={400: {'description': 'Invalid cursor'},
+                       500: {'model': InternalServerErrorResponse}})
 @inject
 async def get_converted_nft_by_phone(
         phone: str = Query(..., regex='^\\+?[1-9][0-9]{7,14}$'),
+        limit: int = Query(settings.CALL_CENTER_PAGE_SIZE, ge=1,
+                           le=settings.CALL_CENTER_MAX_PAGE_SIZE),
+        cursor: str | None = Query(None, description='`next_cursor` of '
+                                                     'the previous page'),
+        stream: bool = False,
         db: AsyncIOMotorDatabase = Depends(Provide[Container.db_manager]),
         logger: Logger = Depends(Provide[Container.logger])):
-    return await get_nft_conversions_detail(phone, db, logger)
+    try:
+        if stream:
+            return StreamingResponse(
+                stream_nft_conversions_detail(phone, db, logger, cursor),
+                media_type='application/x-ndjson')
+
+        return await get_nft_conversions_detail(phone, db, logger,
+                                                limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=str(e))
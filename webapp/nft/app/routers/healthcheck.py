@@ -1,6 +1,9 @@
-from fastapi import APIRouter
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, Response, status
 
-from nft.app.schemas import HealthStatusResponse
+from nft.app.containers import Container
+from nft.app.dependencies import HealthCheck, HealthProber
+from nft.app.schemas import HealthChecksResponse, HealthStatusResponse
 
 router = APIRouter(prefix='/health',
                    tags=['healthcheck'])
@@ -12,3 +15,40 @@ router = APIRouter(prefix='/health',
             response_model=HealthStatusResponse)
 async def get_healthcheck():
     return {'healthy': True}
+
+
+@router.get('/live',
+            summary='Get app liveness status',
+            description='Returns 503 if background tasks have stopped '
+                        'or health probes are stuck',
+            response_model=HealthChecksResponse,
+            responses={503: {'model': HealthChecksResponse}})
+@inject
+async def get_liveness(response: Response,
+                       health_prober: HealthProber = Depends(
+                           Provide[Container.health_prober])):
+    return _report(response, health_prober.liveness())
+
+
+@router.get('/ready',
+            summary='Get app readiness status',
+            description='Returns 503 if Mongo responds too slowly, other '
+                        'checks are informational unless configured '
+                        'to fail readiness',
+            response_model=HealthChecksResponse,
+            responses={503: {'model': HealthChecksResponse}})
+@inject
+async def get_readiness(response: Response,
+                        health_prober: HealthProber = Depends(
+                            Provide[Container.health_prober])):
+    return _report(response, health_prober.readiness())
+
+
+def _report(response: Response, checks: dict[str, HealthCheck]) -> dict:
+    if not (healthy := all(check.healthy for check in checks.values()
+                           if check.gating)):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return {'healthy': healthy,
+            'checks': {name: check._asdict()
+                       for name, check in checks.items()}}
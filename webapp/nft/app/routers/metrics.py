@@ -0,0 +1,29 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from nft.app import metrics
+from nft.app.containers import Container
+from nft.app.dependencies import GiftsCache, NFTStatusCache
+
+router = APIRouter(prefix='/metrics',
+                   tags=['metrics'])
+
+
+@router.get('',
+            summary='Get app metrics',
+            description='Returns metrics in the Prometheus text format',
+            response_class=PlainTextResponse)
+@inject
+async def get_metrics(gifts_cache: GiftsCache = Depends(
+                          Provide[Container.gifts_cache]),
+                      nft_status_cache: NFTStatusCache = Depends(
+                          Provide[Container.nft_status_cache])):
+    for cache, stats in (('gifts', gifts_cache.stats()),
+                         ('nft_status', nft_status_cache.stats())):
+        metrics.cache_hits.labels(cache).set(stats['hits'])
+        metrics.cache_misses.labels(cache).set(stats['misses'])
+        metrics.cache_size.labels(cache).set(stats['size'])
+
+    return PlainTextResponse(metrics.registry.render(),
+                             media_type='text/plain; version=0.0.4')
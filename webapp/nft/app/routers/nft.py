@@ -1,11 +1,15 @@
 from logging import Logger
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from nft.app.config import settings
 from nft.app.containers import Container
-from nft.app.internal import get_nft_gifts, get_nft_status, save_intent_request
+from nft.app.dependencies import (GiftsCache, IntentIdGenerator, NFTStatusBroker,
+                                  NFTStatusCache)
+from nft.app.internal import (get_nft_gifts, get_nft_status, save_intent_request,
+                              wait_nft_status)
 from nft.app.schemas import (IntentRequestIdResponse, InternalServerErrorResponse,
                              NFTConversionRequest, NFTGiftsResponse,
                              NFTIdsRequest, NFTStatusResponse)
@@ -21,11 +25,11 @@ router = APIRouter(prefix='/gifts',
              responses={'500': {'model': InternalServerErrorResponse}})
 @inject
 async def get_gifts_by_nft_ids(nft_ids: NFTIdsRequest,
-                               db: AsyncIOMotorDatabase = Depends(
-                                   Provide[Container.db_manager]),
+                               gifts_cache: GiftsCache = Depends(
+                                   Provide[Container.gifts_cache]),
                                logger: Logger = Depends(
                                    Provide[Container.logger])):
-    return await get_nft_gifts(db, nft_ids, logger)
+    return await get_nft_gifts(gifts_cache, nft_ids, logger)
 
 
 @router.post('/redeem',
@@ -38,9 +42,15 @@ async def get_gifts_by_nft_ids(nft_ids: NFTIdsRequest,
 async def convert_nft(intent_request_data: NFTConversionRequest,
                       db: AsyncIOMotorDatabase = Depends(
                           Provide[Container.db_manager]),
+                      intent_id_generator: IntentIdGenerator = Depends(
+                          Provide[Container.intent_id_generator]),
+                      nft_status_cache: NFTStatusCache = Depends(
+                          Provide[Container.nft_status_cache]),
                       logger: Logger = Depends(
                           Provide[Container.logger])):
-    return await save_intent_request(db, intent_request_data, logger)
+    return await save_intent_request(db, intent_id_generator,
+                                     nft_status_cache, intent_request_data,
+                                     logger)
 
 
 @router.get('/{category_id}/{nft_id}/status',
@@ -51,8 +61,34 @@ async def convert_nft(intent_request_data: NFTConversionRequest,
 @inject
 async def get_nft_conversion_status(category_id: str,
                                     nft_id: str,
-                                    db: AsyncIOMotorDatabase = Depends(
-                                        Provide[Container.db_manager]),
+                                    nft_status_cache: NFTStatusCache = Depends(
+                                        Provide[Container.nft_status_cache]),
                                     logger: Logger = Depends(
                                         Provide[Container.logger])):
-    return await get_nft_status(db, category_id, nft_id, logger)
+    return await get_nft_status(nft_status_cache, category_id, nft_id,
+                                logger)
+
+
+@router.get('/{category_id}/{nft_id}/status/wait',
+            summary='Wait for NFT conversion status change',
+            description='Returns NFT conversion status as soon as it differs '
+                        'from `status` or once `timeout` seconds pass',
+            response_model=NFTStatusResponse,
+            responses={'500': {'model': InternalServerErrorResponse}})
+@inject
+async def wait_nft_conversion_status(
+        category_id: str,
+        nft_id: str,
+        known_status: str | None = Query(
+            None, alias='status',
+            description='Status the client already knows'),
+        timeout: float = Query(settings.NFT_STATUS_WAIT_SECONDS, ge=0,
+                               le=settings.NFT_STATUS_MAX_WAIT_SECONDS),
+        nft_status_cache: NFTStatusCache = Depends(
+            Provide[Container.nft_status_cache]),
+        nft_status_broker: NFTStatusBroker = Depends(
+            Provide[Container.nft_status_broker]),
+        logger: Logger = Depends(Provide[Container.logger])):
+    return await wait_nft_status(nft_status_cache, nft_status_broker,
+                                 category_id, nft_id, known_status, timeout,
+                                 logger)
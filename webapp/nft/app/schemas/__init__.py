@@ -1,4 +1,5 @@
-from .healthcheck.schemas import HealthStatusResponse
+from .healthcheck.schemas import (HealthCheckResult, HealthChecksResponse,
+                                 HealthStatusResponse)
 from .nft.schemas import (NFTConversionRequest, IntentRequestIdResponse,
                           GiftDescription, NFTGifts, NFTGiftsResponse,
                           NFTIdsRequest, NFTStatusResponse)
@@ -14,5 +15,7 @@ __all__ = ['NFTConversionRequest',
            'NFTStatusResponse',
            'InternalServerErrorResponse',
            'HealthStatusResponse',
+           'HealthCheckResult',
+           'HealthChecksResponse',
            'NFTConversionsCheckResponse'
            ]
@@ -9,3 +9,5 @@ class NFTConversionsDetail(BaseModel):
 
 class NFTConversionsCheckResponse(BaseModel):
     conversions: list[NFTConversionsDetail]
+    # Pass as `cursor` to get the next page, None on the last page
+    next_cursor: str | None = None
@@ -3,3 +3,17 @@ from pydantic import BaseModel
 
 class HealthStatusResponse(BaseModel):
     healthy: bool
+
+
+class HealthCheckResult(BaseModel):
+    healthy: bool
+    value: float | None = None
+    # The highest healthy value
+    threshold: float | None = None
+    error: str | None = None
+    # Whether an unhealthy check fails the endpoint
+    gating: bool = True
+
+
+class HealthChecksResponse(HealthStatusResponse):
+    checks: dict[str, HealthCheckResult]
@@ -2,7 +2,7 @@ import re
 
 from pydantic import BaseModel, Field, validator
 
-from nft.app.config import settings
+from nft.app.config import runtime_config, settings
 
 
 class NFTConversionRequest(BaseModel):
@@ -16,14 +16,22 @@ class NFTConversionRequest(BaseModel):
             raise ValueError('An invalid phone provided')
         return v
 
-    @validator('category_id', 'nft_id')
-    def check_nft_in_category(cls, v, **kwargs):
-        if kwargs['field'].name == 'category_id':
-            if not (total := settings.as_dict()['CATEGORY_TOKEN_MAP'].get(v)):
-                raise ValueError('Invalid category')
-            cls.category_limit = total
+    @validator('category_id')
+    def check_category(cls, v):
+        if v not in runtime_config.category_token_map:
+            raise ValueError('Invalid category')
+        return v
+
+    @validator('nft_id')
+    def check_nft_in_category(cls, v, values):
+        # Token limit comes with the values of this very request, nothing
+        # is shared between concurrent validations. An invalid category
+        # is reported by its own validator
+        if (category_id := values.get('category_id')) is None:
+            return v
 
-        elif not v.isdigit() or not 1 <= int(v) <= cls.category_limit:
+        total = runtime_config.category_token_map[category_id]
+        if not v.isdigit() or not 1 <= int(v) <= total:
             raise ValueError('Invalid token')
         return v
 
@@ -60,7 +68,8 @@ class NFTIdInCategory(BaseModel):
 
 
 class NFTIdsRequest(BaseModel):
-    nft_ids: list[NFTIdInCategory]
+    nft_ids: list[NFTIdInCategory] = Field(
+        max_items=settings.MAX_GIFTS_REQUEST_NFTS)
 
 
 class NFTStatusResponse(BaseModel):
@@ -1,3 +1,17 @@
+from .base_chunk_size_controller import ChunkSizeController, ChunkSizeDecision
 from .base_event_scanner_state import EventScannerState
+from .block_watermark import BlockWatermark
+from .lru_cache import LRUCache
+from .metrics import Counter, Gauge, Histogram, MetricsRegistry
+from .token_bucket import TokenBucket
 
-__all__ = ['EventScannerState']
+__all__ = ['BlockWatermark',
+           'ChunkSizeController',
+           'ChunkSizeDecision',
+           'Counter',
+           'EventScannerState',
+           'Gauge',
+           'Histogram',
+           'LRUCache',
+           'MetricsRegistry',
+           'TokenBucket']
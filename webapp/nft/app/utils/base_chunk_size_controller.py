@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import NamedTuple
+
+
+class ChunkSizeDecision(NamedTuple):
+    chunk_size: int
+    next_chunk_size: int
+    scan_duration: float | None
+    logs_found: int | None
+    reason: str
+
+
+class ChunkSizeController(ABC):
+    """Decides how many blocks the scanner asks over `eth_getLogs` at once.
+
+    The latest decisions are kept in `decisions`, so they can be inspected
+    when tuning the controller.
+    """
+
+    def __init__(self, min_chunk_size: int, max_chunk_size: int,
+                 history_size: int = 100):
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.decisions: deque[ChunkSizeDecision] = deque(maxlen=history_size)
+
+    @abstractmethod
+    def next_chunk_size(self, chunk_size: int, scan_duration: float,
+                        logs_found: int) -> int:
+        """Chunk size for the next `eth_getLogs` after a successful one.
+
+        :param chunk_size: Block range of the last request
+        :param scan_duration: How long the last request took in seconds
+        :param logs_found: How many logs the last request returned
+        """
+
+    @abstractmethod
+    def on_failure(self, chunk_size: int) -> int:
+        """Chunk size to retry with after a failed `eth_getLogs`.
+
+        May go below `min_chunk_size`, down to a single block, so a range
+        over the node's log limit can still be fetched.
+        """
+
+    def decide(self, chunk_size: int, next_chunk_size: float, reason: str,
+               scan_duration: float | None = None,
+               logs_found: int | None = None,
+               min_chunk_size: int | None = None) -> int:
+        """Clamp the chunk size to the configured bounds and record it.
+
+        :param min_chunk_size: Lower bound instead of the configured one
+        """
+
+        if min_chunk_size is None:
+            min_chunk_size = self.min_chunk_size
+
+        next_chunk_size = int(max(min_chunk_size,
+                                  min(self.max_chunk_size, next_chunk_size)))
+
+        self.decisions.append(ChunkSizeDecision(
+            chunk_size=chunk_size,
+            next_chunk_size=next_chunk_size,
+            scan_duration=scan_duration,
+            logs_found=logs_found,
+            reason=reason))
+
+        return next_chunk_size
@@ -27,9 +27,18 @@ class EventScannerState(ABC):
         Persistent any data in your state now.
         """
 
+    @abstractmethod
+    async def save(self):
+        """Persist the processed events and the last scanned block.
+
+        Events past the last scanned block may be persisted as well,
+        they are purged by `delete_data` before those blocks are rescanned.
+        """
+
     @abstractmethod
     def process_event(self, block_when: datetime.datetime,
-                      event: AttributeDict) -> object:
+                      event: AttributeDict,
+                      send_gifts: bool = True) -> object:
         """Process incoming events.
 
         This function takes raw events from Web3, transforms them
@@ -40,12 +49,15 @@ class EventScannerState(ABC):
 
         :param event: Symbolic dictionary of the event data
 
+        :param send_gifts: False if the intent is already completed and
+        the event is only stored
+
         :return: Internal state structure that is the result of event
         transformation.
         """
 
     @abstractmethod
-    def delete_data(self, since_block: int):
+    async def delete_data(self, since_block: int):
         """Delete any data since this block was scanned.
 
         Purges any potential minor reorg data.
@@ -0,0 +1,27 @@
+class BlockWatermark:
+    """Track the highest block up to which every block range is completed.
+
+    Ranges may be completed in any order, the watermark only moves over
+    contiguous completed ranges.
+    """
+
+    def __init__(self, last_completed_block: int):
+        self.last_completed_block = last_completed_block
+        self._completed: dict[int, int] = {}
+
+    def complete(self, start_block: int, end_block: int) -> int | None:
+        """Mark blocks `start_block` - `end_block` as completed.
+
+        :return: The new watermark if it has advanced, otherwise None
+        """
+
+        self._completed[start_block] = end_block
+        previous = self.last_completed_block
+
+        while (end := self._completed.pop(
+                self.last_completed_block + 1, None)) is not None:
+            self.last_completed_block = end
+
+        if self.last_completed_block != previous:
+            return self.last_completed_block
+        return None
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Iterator
+
+
+class LRUCache:
+    """A size bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError('LRU cache size must be positive')
+
+        self.max_size = max_size
+        self._data: OrderedDict = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._data:
+            return default
+
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
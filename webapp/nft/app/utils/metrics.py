@@ -0,0 +1,200 @@
+import bisect
+import math
+import threading
+from typing import Iterable, Iterator
+
+# Latency buckets in seconds, the same as Prometheus client libraries use
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+
+
+class _Value:
+    """Single counter or gauge value.
+
+    Updated under a lock, since Mongo command listeners report
+    from driver threads.
+    """
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramValue:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # Non-cumulative, the last one is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+
+class Metric:
+    """Metric family with optional labels, rendered in the Prometheus text
+    exposition format.
+    """
+
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Value of the metric for the given label values."""
+
+        key = tuple(str(value) for value in values)
+
+        if (child := self._children.get(key)) is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f'Metric {self.name} expects labels '
+                                 f'{self.labelnames}, got {values}')
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+
+        return child
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.type_name}'
+
+        for key, child in list(self._children.items()):
+            yield from self._render_child(dict(zip(self.labelnames, key)),
+                                          child)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _render_child(self, labels: dict, child) -> Iterator[str]:
+        yield f'{self.name}{_format_labels(labels)} {_format_value(child.value)}'
+
+
+class Counter(Metric):
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+
+class Gauge(Metric):
+    type_name = 'gauge'
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+
+class Histogram(Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def _render_child(self, labels: dict,
+                      child: _HistogramValue) -> Iterator[str]:
+        with child._lock:
+            counts = list(child.counts)
+            total = child.sum
+
+        cumulative = 0
+        for upper_bound, count in zip((*self.buckets, math.inf), counts):
+            cumulative += count
+            bucket_labels = _format_labels(
+                {**labels, 'le': _format_value(upper_bound)})
+            yield f'{self.name}_bucket{bucket_labels} {cumulative}'
+
+        yield f'{self.name}_sum{_format_labels(labels)} {_format_value(total)}'
+        yield f'{self.name}_count{_format_labels(labels)} {cumulative}'
+
+
+class MetricsRegistry:
+    """Collection of metrics exported together."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def counter(self, name: str, documentation: str,
+                labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str,
+              labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str,
+                  labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames,
+                                        buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+
+        return ''.join(f'{line}\n' for metric in self._metrics.values()
+                       for line in metric.render())
+
+    def _register(self, metric: Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+
+        self._metrics[metric.name] = metric
+        return metric
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+
+    def _escape(value: str) -> str:
+        return (value.replace('\\', r'\\').replace('\n', r'\n')
+                .replace('"', r'\"'))
+
+    return '{' + ','.join(f'{name}="{_escape(value)}"'
+                          for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value))
@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Asynchronous token bucket rate limiter.
+
+    Allows `rate` acquisitions per second on average and bursts of up to
+    `capacity` acquisitions.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0 or capacity < 1:
+            raise ValueError('Token bucket rate and capacity must be positive')
+
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self._tokens) / self.rate)
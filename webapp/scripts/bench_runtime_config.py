@@ -0,0 +1,59 @@
+"""Micro-benchmark of category map lookups on hot paths.
+
+Compares reading a category through `settings.as_dict()`, as request
+handlers used to, with reading it from `runtime_config`. Run from the
+webapp directory with the settings of the environment to measure:
+
+    ENV_FOR_DYNACONF=staging python scripts/bench_runtime_config.py
+"""
+import argparse
+import sys
+import timeit
+from os.path import abspath, dirname
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from nft.app.config import runtime_config, settings  # noqa: E402
+from nft.app.schemas import NFTConversionRequest  # noqa: E402
+
+
+def report(name: str, statement, number: int):
+    best = min(timeit.repeat(statement, number=number, repeat=5))
+    print(f'{name:<40} {best / number * 1e6:>12.2f} us')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=1000,
+                        help='Lookups per timing run')
+    parser.add_argument('--extra-settings', type=int, default=300,
+                        help='Settings added for the grown config run')
+    args = parser.parse_args()
+
+    category_id = next(iter(runtime_config.category_token_map))
+    request = {'category_id': category_id, 'nft_id': '1',
+               'phone': '+79990000000'}
+
+    def as_dict_lookup():
+        return settings.as_dict().get('NFT_CATEGORY_MAP').get(category_id)
+
+    def runtime_config_lookup():
+        return runtime_config.nft_category_map.get(category_id)
+
+    print(f'{"lookup":<40} {"best":>15}')
+    report('settings.as_dict()', as_dict_lookup, args.number)
+    report('runtime_config', runtime_config_lookup, args.number)
+    report('NFTConversionRequest validation',
+           lambda: NFTConversionRequest(**request), args.number)
+
+    # as_dict() copies everything, so its cost grows with the config
+    for i in range(args.extra_settings):
+        settings.set(f'BENCH_EXTRA_{i}', {'values': list(range(10))})
+    report(f'settings.as_dict(), +{args.extra_settings} settings',
+           as_dict_lookup, max(args.number // 100, 1))
+    report(f'runtime_config, +{args.extra_settings} settings',
+           runtime_config_lookup, args.number)
+
+
+if __name__ == '__main__':
+    main()
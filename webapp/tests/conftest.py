@@ -0,0 +1,154 @@
+import copy
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# Secrets are not needed by the tests, but the container reads them
+# when the application package is imported
+os.environ.setdefault('MONGO_CONNECTION_STRING', 'mongodb://localhost:27017')
+os.environ.setdefault('MLP_CLIENT', 'test')
+os.environ.setdefault('MLP_SECRET', 'test')
+
+
+class FakeCollection:
+    """In-memory collection with the part of the Motor API the app uses."""
+
+    def __init__(self):
+        self.documents: list[dict] = []
+        # Raised by the next write, to test failure handling
+        self.fail_next_write: Exception | None = None
+
+    async def find_one(self, filter: dict, projection=None, sort=None):
+        documents = self._sorted(filter, sort)
+        return copy.deepcopy(documents[0]) if documents else None
+
+    async def find_one_and_update(self, filter: dict, update: dict,
+                                  sort=None, return_document=False):
+        self._raise_failure()
+        if not (documents := self._sorted(filter, sort)):
+            return None
+        before = copy.deepcopy(documents[0])
+        _apply(documents[0], update)
+        # ReturnDocument.AFTER is True
+        return copy.deepcopy(documents[0]) if return_document else before
+
+    def find(self, filter: dict, projection=None, sort=None, limit=0,
+             batch_size=None) -> 'FakeCursor':
+        documents = self._sorted(filter, sort)
+        return FakeCursor([copy.deepcopy(doc)
+                           for doc in documents[:limit or None]])
+
+    async def update_one(self, filter: dict, update: dict, upsert=False):
+        self._raise_failure()
+        return SimpleNamespace(
+            matched_count=int(self._update(filter, update, upsert)))
+
+    async def bulk_write(self, requests: list, ordered=True):
+        self._raise_failure()
+        for request in requests:
+            self._update(request._filter, request._doc, request._upsert)
+
+    async def delete_many(self, filter: dict):
+        self._raise_failure()
+        self.documents = [doc for doc in self.documents
+                          if not _matches(doc, filter)]
+
+    def _sorted(self, filter: dict, sort) -> list[dict]:
+        documents = [doc for doc in self.documents if _matches(doc, filter)]
+        for key, direction in reversed(sort or []):
+            documents.sort(key=lambda doc: doc[key], reverse=direction < 0)
+        return documents
+
+    def _update(self, filter: dict, update: dict, upsert: bool) -> bool:
+        """:return: Whether a document matched"""
+
+        on_insert = update.get('$setOnInsert', {})
+        update = {key: value for key, value in update.items()
+                  if key != '$setOnInsert'}
+
+        for doc in self.documents:
+            if _matches(doc, filter):
+                _apply(doc, update)
+                return True
+        if upsert:
+            doc = {**filter, **copy.deepcopy(on_insert)}
+            _apply(doc, update)
+            self.documents.append(doc)
+        return False
+
+    def _raise_failure(self):
+        if (error := self.fail_next_write) is not None:
+            self.fail_next_write = None
+            raise error
+
+
+class FakeCursor:
+    def __init__(self, documents: list[dict]):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+    async def to_list(self, length: int | None) -> list[dict]:
+        return self.documents[:length]
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections: dict[str, FakeCollection] = {}
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        return self.collections.setdefault(name, FakeCollection())
+
+
+def _apply(doc: dict, update: dict):
+    for key, value in update.get('$set', {}).items():
+        doc[key] = copy.deepcopy(value)
+    for key, value in update.get('$inc', {}).items():
+        doc[key] = doc.get(key, 0) + value
+    for key, value in update.get('$addToSet', {}).items():
+        for item in value['$each'] if isinstance(value, dict) else [value]:
+            if item not in doc.setdefault(key, []):
+                doc[key].append(item)
+
+
+def _matches(doc: dict, filter: dict) -> bool:
+    for key, condition in filter.items():
+        if key == '$and':
+            if not all(_matches(doc, sub_filter) for sub_filter in condition):
+                return False
+        elif key == '$or':
+            if not any(_matches(doc, sub_filter) for sub_filter in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(key)
+            for operator, operand in condition.items():
+                if operator == '$gte' and not (value is not None
+                                               and value >= operand):
+                    return False
+                if operator == '$lte' and not (value is not None
+                                               and value <= operand):
+                    return False
+                if operator == '$lt' and not (value is not None
+                                              and value < operand):
+                    return False
+                if operator == '$in' and value not in operand:
+                    return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
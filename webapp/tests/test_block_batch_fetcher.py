@@ -0,0 +1,130 @@
+import logging
+
+import pytest
+from aiohttp import web
+
+from nft.app.dependencies import BlockTimestampBatchFetcher
+
+pytestmark = pytest.mark.anyio
+
+
+class StubJsonRpcNode:
+    """Local HTTP JSON-RPC server answering `eth_getBlockByNumber`."""
+
+    def __init__(self, batch_supported=True, max_batch_size=None,
+                 failures=()):
+        self.batch_supported = batch_supported
+        self.max_batch_size = max_batch_size
+        # HTTP statuses of the first requests, before the node recovers
+        self.failures = list(failures)
+        self.requests = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        self.requests.append(payload)
+
+        if self.failures:
+            return web.Response(status=self.failures.pop(0))
+
+        if isinstance(payload, list):
+            if not self.batch_supported:
+                return web.json_response({
+                    'jsonrpc': '2.0', 'id': None,
+                    'error': {'code': -32600,
+                              'message': 'batch requests are not supported'}})
+            if self.max_batch_size and len(payload) > self.max_batch_size:
+                return web.Response(status=413)
+            return web.json_response([self._answer(call) for call in payload])
+
+        return web.json_response(self._answer(payload))
+
+    @staticmethod
+    def _answer(call: dict) -> dict:
+        block_num = int(call['params'][0], 16)
+        return {'jsonrpc': '2.0', 'id': call['id'],
+                'result': {'number': hex(block_num),
+                           'timestamp': hex(1_650_000_000 + block_num)}}
+
+
+@pytest.fixture
+async def serve():
+    runners = []
+
+    async def _serve(node: StubJsonRpcNode) -> str:
+        app = web.Application()
+        app.router.add_post('/', node.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        runners.append(runner)
+        port = runner.addresses[0][1]
+        return f'http://127.0.0.1:{port}/'
+
+    yield _serve
+
+    for runner in runners:
+        await runner.cleanup()
+
+
+@pytest.fixture
+async def make_fetcher():
+    fetchers = []
+
+    def _make_fetcher(endpoint_uri: str, max_batch_size=100):
+        fetcher = BlockTimestampBatchFetcher(
+            endpoint_uri=endpoint_uri, max_batch_size=max_batch_size,
+            concurrency=5, timeout=5, retries=3, retry_delay=0.01,
+            max_retry_delay=0.01, logger=logging.getLogger('test'))
+        fetchers.append(fetcher)
+        return fetcher
+
+    yield _make_fetcher
+
+    for fetcher in fetchers:
+        await fetcher.close()
+
+
+async def test_blocks_are_fetched_in_batches(serve, make_fetcher):
+    node = StubJsonRpcNode()
+    fetcher = make_fetcher(await serve(node))
+
+    timestamps = await fetcher.fetch_timestamps(list(range(1, 251)))
+
+    assert len(node.requests) == 3
+    assert len(timestamps) == 250
+    assert timestamps[42].timestamp() == 1_650_000_042
+
+
+async def test_rejected_batches_fall_back_to_single_calls(serve,
+                                                          make_fetcher):
+    node = StubJsonRpcNode(batch_supported=False)
+    fetcher = make_fetcher(await serve(node))
+
+    timestamps = await fetcher.fetch_timestamps([1, 2, 3])
+
+    assert not fetcher.batch_supported
+    assert sorted(timestamps) == [1, 2, 3]
+
+
+async def test_server_errors_are_retried(serve, make_fetcher):
+    node = StubJsonRpcNode(failures=[502, 503])
+    fetcher = make_fetcher(await serve(node))
+
+    timestamps = await fetcher.fetch_timestamps([1, 2, 3])
+
+    assert fetcher.batch_supported
+    assert len(node.requests) == 3
+    assert sorted(timestamps) == [1, 2, 3]
+
+
+async def test_too_large_batches_are_split(serve, make_fetcher):
+    node = StubJsonRpcNode(max_batch_size=30)
+    fetcher = make_fetcher(await serve(node))
+
+    timestamps = await fetcher.fetch_timestamps(list(range(1, 101)))
+
+    assert fetcher.batch_supported
+    assert fetcher.max_batch_size == 25
+    assert len(timestamps) == 100
+    assert all(isinstance(call, list) for call in node.requests)
@@ -0,0 +1,29 @@
+from nft.app.utils import BlockWatermark
+
+
+def test_advances_over_contiguous_ranges():
+    watermark = BlockWatermark(99)
+
+    assert watermark.complete(100, 109) == 109
+    assert watermark.complete(110, 119) == 119
+    assert watermark.last_completed_block == 119
+
+
+def test_out_of_order_ranges_wait_for_the_gap():
+    watermark = BlockWatermark(99)
+
+    assert watermark.complete(120, 129) is None
+    assert watermark.complete(110, 119) is None
+    assert watermark.last_completed_block == 99
+
+    # Filling the gap moves over every range completed meanwhile
+    assert watermark.complete(100, 109) == 129
+    assert watermark.complete(130, 130) == 130
+
+
+def test_range_past_a_gap_does_not_advance():
+    watermark = BlockWatermark(99)
+
+    assert watermark.complete(100, 104) == 104
+    assert watermark.complete(106, 110) is None
+    assert watermark.last_completed_block == 104
@@ -0,0 +1,63 @@
+import pytest
+
+from nft.app.dependencies import (AIMDChunkSizeController,
+                                  HitMissChunkSizeController)
+
+
+@pytest.fixture
+def aimd():
+    return AIMDChunkSizeController(
+        min_chunk_size=3, max_chunk_size=20, increase_step=2,
+        decrease_factor=0.5, target_scan_seconds=2.0, max_logs=200)
+
+
+def test_aimd_grows_additively_within_targets(aimd):
+    assert aimd.next_chunk_size(10, scan_duration=1.0, logs_found=5) == 12
+    assert aimd.decisions[-1].reason == 'within targets'
+
+
+@pytest.mark.parametrize('scan_duration, logs_found, reason', [
+    (3.0, 5, 'slow'),
+    (1.0, 500, 'too many logs'),
+])
+def test_aimd_shrinks_multiplicatively(aimd, scan_duration, logs_found,
+                                       reason):
+    assert aimd.next_chunk_size(10, scan_duration, logs_found) == 5
+    assert aimd.decisions[-1].reason == reason
+
+
+def test_aimd_is_clamped(aimd):
+    assert aimd.next_chunk_size(19, scan_duration=1.0, logs_found=5) == 20
+    assert aimd.next_chunk_size(4, scan_duration=3.0, logs_found=5) == 3
+
+
+@pytest.mark.parametrize('controller', [
+    AIMDChunkSizeController(min_chunk_size=3, max_chunk_size=20,
+                            increase_step=2, decrease_factor=0.5,
+                            target_scan_seconds=2.0, max_logs=200),
+    HitMissChunkSizeController(min_chunk_size=3, max_chunk_size=20,
+                               increase_factor=2.0, decrease_factor=0.5),
+])
+def test_failures_shrink_down_to_a_single_block(controller):
+    chunk_sizes = [20]
+    while chunk_sizes[-1]:
+        chunk_sizes.append(controller.on_failure(chunk_sizes[-1]))
+
+    # Below the floor of successful requests, as the node may not serve
+    # even the smallest regular range
+    assert chunk_sizes == [20, 10, 5, 2, 1, 0]
+    # The next successful request is back within the bounds
+    assert controller.next_chunk_size(0, scan_duration=1.0,
+                                      logs_found=0) == 3
+
+
+def test_hit_miss_grows_until_the_first_hit():
+    controller = HitMissChunkSizeController(
+        min_chunk_size=3, max_chunk_size=20, increase_factor=2.0,
+        decrease_factor=0.5)
+
+    assert controller.next_chunk_size(5, scan_duration=1.0, logs_found=0) == 10
+    assert controller.next_chunk_size(15, scan_duration=1.0,
+                                      logs_found=0) == 20
+    assert controller.next_chunk_size(20, scan_duration=1.0,
+                                      logs_found=1) == 3
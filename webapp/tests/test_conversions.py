@@ -0,0 +1,120 @@
+import datetime
+import json
+import logging
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from nft.app.internal import (IntentRequestStatus, InvalidCursorError,
+                              get_nft_conversions_detail,
+                              stream_nft_conversions_detail)
+from nft.app.internal.conversions import (NO_CONVERSIONS, _decode_cursor,
+                                          _encode_cursor)
+from nft.app.routers import call_center
+
+pytestmark = pytest.mark.anyio
+
+PHONE = '+79990000000'
+logger = logging.getLogger('test')
+
+
+@pytest.fixture
+def conversions(db) -> list[str]:
+    """nft ids of the phone's conversions, newest first."""
+
+    noon = datetime.datetime(2022, 6, 1, 12)
+    # Several requests share a datetime, the page boundary falls among them
+    datetimes = [noon + datetime.timedelta(minutes=1)] + [noon] * 4 + [
+        noon - datetime.timedelta(minutes=1)]
+
+    for nft_id, request_datetime in enumerate(datetimes):
+        db.intent_ids.documents.append({
+            '_id': ObjectId(), 'phone': PHONE, 'category_id': '1',
+            'nft_id': str(nft_id),
+            'status': IntentRequestStatus.COMPLETED.value,
+            'request_datetime': request_datetime})
+
+    db.intent_ids.documents.append({
+        '_id': ObjectId(), 'phone': '+71110000000', 'category_id': '1',
+        'nft_id': '100', 'status': IntentRequestStatus.PENDING.value,
+        'request_datetime': noon})
+
+    newest_first = sorted(
+        (doc for doc in db.intent_ids.documents if doc['phone'] == PHONE),
+        key=lambda doc: (doc['request_datetime'], doc['_id']), reverse=True)
+    return [doc['nft_id'] for doc in newest_first]
+
+
+async def test_pages_cover_all_conversions_once(db, conversions):
+    nft_ids, cursor = [], None
+
+    while True:
+        page = await get_nft_conversions_detail(PHONE, db, logger,
+                                                limit=2, cursor=cursor)
+        nft_ids += [conversion['nft_id'] for conversion in page['conversions']]
+        if (cursor := page['next_cursor']) is None:
+            break
+
+    assert nft_ids == conversions
+
+
+def test_cursor_round_trip():
+    intent_request = {'_id': ObjectId(),
+                      'request_datetime': datetime.datetime(2022, 6, 1, 12)}
+
+    assert _decode_cursor(_encode_cursor(intent_request)) == (
+        intent_request['request_datetime'], intent_request['_id'])
+
+
+@pytest.mark.parametrize('cursor', ['not base64!', 'W10=', 'WyJ4IiwgInkiXQ=='])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        _decode_cursor(cursor)
+
+
+async def call_endpoint(db, **kwargs):
+    return await call_center.get_converted_nft_by_phone(
+        phone=PHONE, limit=2, db=db, logger=logger,
+        **{'cursor': None, 'stream': False, **kwargs})
+
+
+@pytest.mark.parametrize('stream', [False, True])
+async def test_invalid_cursor_is_a_bad_request(db, stream):
+    with pytest.raises(HTTPException) as e:
+        await call_endpoint(db, cursor='W10=', stream=stream)
+    assert e.value.status_code == 400
+
+
+async def test_other_errors_are_not_a_bad_request(db, monkeypatch):
+    async def _fail(*args):
+        raise ValueError('Unrelated')
+
+    monkeypatch.setattr(call_center, 'get_nft_conversions_detail', _fail)
+
+    with pytest.raises(ValueError, match='Unrelated'):
+        await call_endpoint(db)
+
+
+async def read_stream(stream) -> list[dict]:
+    return [json.loads(line) async for line in stream]
+
+
+async def test_stream_returns_all_conversions(db, conversions):
+    lines = await read_stream(stream_nft_conversions_detail(PHONE, db, logger))
+    assert [line['nft_id'] for line in lines] == conversions
+
+
+async def test_stream_resumes_from_cursor(db, conversions):
+    page = await get_nft_conversions_detail(PHONE, db, logger, limit=2)
+
+    lines = await read_stream(stream_nft_conversions_detail(
+        PHONE, db, logger, page['next_cursor']))
+    assert [line['nft_id'] for line in lines] == conversions[2:]
+
+
+async def test_no_conversions_placeholder(db):
+    page = await get_nft_conversions_detail(PHONE, db, logger, limit=2)
+    lines = await read_stream(stream_nft_conversions_detail(PHONE, db, logger))
+
+    assert page['conversions'] == lines == [NO_CONVERSIONS]
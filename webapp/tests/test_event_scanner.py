@@ -0,0 +1,194 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from nft.app import internal
+from nft.app.dependencies import EventScanner, ScannerDatabaseState
+from nft.app.internal import IntentRequestStatus
+
+pytestmark = pytest.mark.anyio
+
+
+def make_event(block_number: int, intent_id: int) -> dict:
+    return {
+        'event': 'PresentIntent',
+        'blockNumber': block_number,
+        'transactionHash': bytes([block_number % 256]) * 32,
+        'logIndex': 0,
+        'args': {'tokenId': 1, 'tokenTokenIdInLevel': 1,
+                 'presentIntent': intent_id, 'level': 1}
+    }
+
+
+@pytest.fixture
+async def state(db):
+    state = ScannerDatabaseState(db, logging.getLogger('test'))
+    await state.restore()
+    return state
+
+
+class FakeEth:
+    async def get_block(self, block_num: int) -> dict:
+        return {'number': block_num, 'timestamp': 1_650_000_000 + block_num}
+
+
+@pytest.fixture
+def scanner(state):
+    return EventScanner(web3=SimpleNamespace(eth=FakeEth()), contract=None,
+                        state=state, events=[], filters={},
+                        logger=logging.getLogger('test'))
+
+
+@pytest.fixture(autouse=True)
+def no_gifts(monkeypatch):
+    async def _fail(args):
+        raise AssertionError(f'Gifts sent for {args}')
+
+    monkeypatch.setattr(internal, 'check_event_and_send_gifts', _fail)
+
+
+async def test_rescanned_completed_events_are_kept(db, state, scanner):
+    # The previous cycle stored the event and completed its intent
+    event = make_event(block_number=99, intent_id=7)
+    await db.intent_ids.update_one(
+        {'intent_id': 7},
+        {'$set': {'status': IntentRequestStatus.COMPLETED.value}},
+        upsert=True)
+    await state.process_event(None, event, send_gifts=False)
+    await state.end_chunk(100)
+
+    # The next cycle purges and rescans the reorg-safe blocks
+    await scanner.delete_potentially_forked_block_data(98)
+    await scanner.process_chunk([event])
+    await state.end_chunk(101)
+
+    assert [doc['block_number'] for doc
+            in db.scanned_events.documents] == [99]
+
+
+async def test_events_are_kept_when_save_fails(db, state):
+    await state.process_event(None, make_event(99, intent_id=7),
+                              send_gifts=False)
+    db.scanned_events.fail_next_write = ConnectionError('Mongo is down')
+
+    with pytest.raises(ConnectionError):
+        await state.end_chunk(100)
+    await state.end_chunk(101)
+
+    assert [doc['block_number'] for doc
+            in db.scanned_events.documents] == [99]
+
+
+@pytest.fixture
+def pipeline(scanner, state, monkeypatch):
+    """Scan stages replaced by fakes, recording what happened in order."""
+
+    log = []
+    fail_at_block = None
+
+    async def _fetch_chunk(start_block: int, end_block: int):
+        if fail_at_block is not None and start_block >= fail_at_block:
+            raise ConnectionError('Node is down')
+        # Fetching runs ahead while processing is slower
+        await asyncio.sleep(0)
+        log.append(('fetch', start_block, end_block))
+        return end_block, [make_event(block_number, intent_id=block_number)
+                           for block_number in (start_block, end_block)], 0.0
+
+    async def _process_chunk(events: list) -> list:
+        await asyncio.sleep(0.001)
+        log.append(('process', [evt['blockNumber'] for evt in events]))
+        return events
+
+    end_chunk = state.end_chunk
+
+    async def _end_chunk(block_number: int):
+        log.append(('end_chunk', block_number))
+        await end_chunk(block_number)
+
+    monkeypatch.setattr(scanner, 'fetch_chunk', _fetch_chunk)
+    monkeypatch.setattr(scanner, 'process_chunk', _process_chunk)
+    monkeypatch.setattr(state, 'end_chunk', _end_chunk)
+
+    def _fail_at(block_number: int):
+        nonlocal fail_at_block
+        fail_at_block = block_number
+
+    return SimpleNamespace(log=log, fail_at=_fail_at)
+
+
+async def test_scan_processes_chunks_in_order(scanner, state, pipeline):
+    processed, chunks_count = await scanner.scan(100, 160, start_chunk_size=5)
+
+    fetched = [entry[1:] for entry in pipeline.log if entry[0] == 'fetch']
+    assert chunks_count == len(fetched)
+    # Chunks are contiguous and cover the whole range
+    assert fetched[0][0] == 100 and fetched[-1][1] == 160
+    assert all(end + 1 == start
+               for (_, end), (start, _) in zip(fetched, fetched[1:]))
+
+    # Events are processed in block order
+    blocks = [evt['blockNumber'] for evt in processed]
+    assert blocks == sorted(blocks)
+
+    # The cursor advances once per chunk, after its events are processed
+    consumed = [entry for entry in pipeline.log if entry[0] != 'fetch']
+    assert consumed == [
+        entry for start, end in fetched
+        for entry in (('process', [start, end]), ('end_chunk', end))]
+    assert state.get_last_scanned_block() == 160
+
+
+async def test_scan_reports_fetch_failure(scanner, state, pipeline):
+    pipeline.fail_at(120)
+
+    with pytest.raises(ConnectionError):
+        await scanner.scan(100, 160, start_chunk_size=5)
+
+    # Chunks fetched before the failure are completed, nothing past it
+    fetched = [entry[2] for entry in pipeline.log if entry[0] == 'fetch']
+    ends = [entry[1] for entry in pipeline.log if entry[0] == 'end_chunk']
+    # The next chunk is the one which failed
+    assert ends == fetched and ends[-1] + 1 >= 120
+    assert state.get_last_scanned_block() == ends[-1]
+
+
+async def test_backfill_saves_events_past_a_slow_range(db, scanner, state,
+                                                       monkeypatch):
+    scanner.backfill_workers = 2
+    scanner.backfill_range_size = 10
+    first_range_started = asyncio.Event()
+    later_range_saved = asyncio.Event()
+
+    async def _fetch_chunk(start_block: int, end_block: int):
+        if start_block == 100:
+            first_range_started.set()
+            # The slow range only finishes once the next one is saved
+            await asyncio.wait_for(later_range_saved.wait(), 1)
+        else:
+            await first_range_started.wait()
+        return end_block, [make_event(start_block, intent_id=start_block)], 0.0
+
+    async def _process_chunk(events: list) -> list:
+        for evt in events:
+            await state.process_event(None, evt, send_gifts=False)
+        return events
+
+    save = state.save
+
+    async def _save():
+        await save()
+        if db.scanned_events.documents:
+            later_range_saved.set()
+
+    monkeypatch.setattr(scanner, 'fetch_chunk', _fetch_chunk)
+    monkeypatch.setattr(scanner, 'process_chunk', _process_chunk)
+    monkeypatch.setattr(state, 'save', _save)
+
+    await scanner.backfill(100, 119, start_chunk_size=100)
+
+    assert state.get_last_scanned_block() == 119
+    assert sorted(doc['block_number']
+                  for doc in db.scanned_events.documents) == [100, 110]
@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+
+from nft.app.dependencies import ScannerDatabaseState
+
+pytestmark = pytest.mark.anyio
+
+
+def make_event(block_number: int, log_index: int = 0) -> dict:
+    return {
+        'event': 'PresentIntent',
+        'blockNumber': block_number,
+        'transactionHash': bytes([block_number % 256]) * 32,
+        'logIndex': log_index,
+        'args': {'tokenId': 1, 'tokenTokenIdInLevel': 1,
+                 'presentIntent': block_number, 'level': 1}
+    }
+
+
+@pytest.fixture
+async def state(db):
+    state = ScannerDatabaseState(db, logging.getLogger('test'))
+    await state.restore()
+    return state
+
+
+async def test_delete_data_removes_events_above_reorg_point(db, state):
+    for block_number in (10, 20, 30):
+        await state.process_event(None, make_event(block_number),
+                                  send_gifts=False)
+        await state.end_chunk(block_number)
+
+    # Not saved yet
+    await state.process_event(None, make_event(31), send_gifts=False)
+    await state.process_event(None, make_event(32), send_gifts=False)
+
+    await state.delete_data(20)
+
+    assert [doc['block_number']
+            for doc in db.scanned_events.documents] == [10]
+    assert state.current_state['blocks'] == {}
+    assert state.last_event_block == 19
+
+
+async def test_delete_data_after_restore(db, state):
+    for block_number in (10, 20):
+        await state.process_event(None, make_event(block_number),
+                                  send_gifts=False)
+    await state.end_chunk(20)
+
+    restored = ScannerDatabaseState(db, logging.getLogger('test'))
+    await restored.restore()
+    await restored.delete_data(15)
+
+    assert restored.get_last_scanned_block() == 20
+    assert [doc['block_number']
+            for doc in db.scanned_events.documents] == [10]
@@ -0,0 +1,76 @@
+import datetime
+import logging
+
+import pytest
+
+from nft.app.dependencies import GiftDeliveryStatus, GiftOutbox
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def gift_outbox(db):
+    return GiftOutbox(db, max_attempts=2, backoff_seconds=5,
+                      max_backoff_seconds=60, lease_seconds=120,
+                      logger=logging.getLogger('test'))
+
+
+async def enqueue(gift_outbox: GiftOutbox, intent_id: int):
+    await gift_outbox.enqueue({'intent_id': intent_id, 'phone': '+70000000000',
+                               'nft_id': '1', 'category_id': '1'})
+
+
+def expire_lease(db, intent_id: int):
+    for doc in db.gift_outbox.documents:
+        if doc['_id'] == intent_id:
+            doc['next_attempt_at'] = (datetime.datetime.utcnow()
+                                      - datetime.timedelta(seconds=1))
+
+
+async def test_claimed_records_share_the_lease(gift_outbox):
+    for intent_id in range(3):
+        await enqueue(gift_outbox, intent_id)
+
+    records = await gift_outbox.claim_many(10)
+
+    assert len({record['next_attempt_at'] for record in records}) == 1
+    assert 119 < gift_outbox.lease_remaining(records) <= 120
+
+
+async def test_expired_lease_has_no_time_remaining(db, gift_outbox):
+    await enqueue(gift_outbox, 1)
+    records = await gift_outbox.claim_many(10)
+
+    expire_lease(db, 1)
+    records[0]['next_attempt_at'] = db.gift_outbox.documents[0][
+        'next_attempt_at']
+
+    assert gift_outbox.lease_remaining(records) == 0
+
+
+async def test_lost_lease_records_nothing(db, gift_outbox):
+    await enqueue(gift_outbox, 1)
+    stale = await gift_outbox.claim()
+
+    expire_lease(db, 1)
+    current = await gift_outbox.claim()
+
+    assert not await gift_outbox.mark_channels_sent(stale, ['sms'])
+    assert not await gift_outbox.mark_sent(stale)
+    assert 'sent_channels' not in db.gift_outbox.documents[0]
+
+    assert await gift_outbox.mark_channels_sent(current, ['sms'])
+    assert db.gift_outbox.documents[0]['sent_channels'] == ['sms']
+
+
+async def test_lease_expiry_counts_as_an_attempt(db, gift_outbox):
+    await enqueue(gift_outbox, 1)
+
+    for attempt in (1, 2):
+        assert (await gift_outbox.claim())['attempts'] == attempt
+        expire_lease(db, 1)
+
+    # The lease of the last attempt expired, the delivery is given up
+    assert await gift_outbox.claim() is None
+    assert db.gift_outbox.documents[0]['status'] == (
+        GiftDeliveryStatus.FAILED.value)
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+
+import pytest
+
+from nft.app.dependencies import GiftsCache
+
+pytestmark = pytest.mark.anyio
+
+GIFTS = [{'type': 'discount'}]
+
+
+@pytest.fixture
+def catalogue_loads(db, monkeypatch):
+    """Whole catalogue queries sent to the database."""
+
+    db.gifts.documents = [{'category_id': '1', 'nft_id': '1',
+                           'gifts': GIFTS}]
+    loads = []
+    find = db.gifts.find
+
+    async def _find(filter: dict, projection=None):
+        if not filter:
+            loads.append(filter)
+        # A real query lets other lookups run meanwhile
+        await asyncio.sleep(0)
+        async for doc in find(filter, projection):
+            yield doc
+
+    monkeypatch.setattr(db.gifts, 'find', _find)
+    return loads
+
+
+@pytest.fixture
+def gifts_cache(db):
+    return GiftsCache(db, ttl=300, max_missing=10,
+                      logger=logging.getLogger('test'))
+
+
+async def test_concurrent_lookups_share_a_single_load(gifts_cache,
+                                                      catalogue_loads):
+    results = await asyncio.gather(*(gifts_cache.get('1', '1')
+                                     for _ in range(20)))
+    assert results == [GIFTS] * 20
+    assert len(catalogue_loads) == 1
+
+    gifts_cache.invalidate()
+    await asyncio.gather(*(gifts_cache.get('1', '1') for _ in range(20)))
+    assert len(catalogue_loads) == 2
+
+
+async def test_unknown_nft_is_remembered_without_reloading(
+        gifts_cache, catalogue_loads):
+    assert await gifts_cache.get('1', '404') is None
+    assert await gifts_cache.get('1', '404') is None
+
+    assert len(catalogue_loads) == 1
+    assert gifts_cache.misses == 1
@@ -0,0 +1,86 @@
+import datetime
+import logging
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+
+from nft.app.dependencies import HealthProber
+from nft.app.routers.healthcheck import _report
+
+pytestmark = pytest.mark.anyio
+
+HEAD_BLOCK = 1000
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.down = False
+
+    async def command(self, name: str):
+        if self.down:
+            raise ConnectionError('Mongo is down')
+        return {'ok': 1}
+
+
+class FakeEth:
+    @property
+    async def block_number(self) -> int:
+        return HEAD_BLOCK
+
+
+class FakeScanner:
+    web3 = SimpleNamespace(eth=FakeEth())
+
+    async def get_block_when(self, block_number: int) -> datetime.datetime:
+        # A block per second
+        return datetime.datetime.utcnow() - datetime.timedelta(
+            seconds=HEAD_BLOCK - block_number)
+
+
+def make_prober(db: FakeDatabase, last_scanned_block: int) -> HealthProber:
+    state = SimpleNamespace(
+        get_last_scanned_block=lambda: last_scanned_block,
+        last_chunk_at=None)
+    return HealthProber(
+        db, FakeScanner(), state, interval=10, timeout=1,
+        thresholds={HealthProber.MONGO_PING: 1.0,
+                    HealthProber.SCANNER_LAG_BLOCKS: 200,
+                    HealthProber.SCANNER_LAG_SECONDS: 600},
+        readiness_checks=[HealthProber.MONGO_PING], max_probe_age=60,
+        logger=logging.getLogger('test'))
+
+
+async def test_lagging_scanner_does_not_fail_readiness():
+    prober = make_prober(FakeDatabase(), last_scanned_block=0)
+    await prober.probe()
+
+    response = Response()
+    report = _report(response, prober.readiness())
+
+    assert response.status_code == 200
+    assert report['healthy']
+    lag = report['checks'][HealthProber.SCANNER_LAG_BLOCKS]
+    assert not lag['healthy'] and not lag['gating']
+    assert report['checks'][HealthProber.MONGO_PING]['gating']
+
+
+async def test_mongo_failure_fails_readiness():
+    db = FakeDatabase()
+    db.down = True
+    prober = make_prober(db, last_scanned_block=HEAD_BLOCK)
+    await prober.probe()
+
+    response = Response()
+    report = _report(response, prober.readiness())
+
+    assert response.status_code == 503
+    assert not report['healthy']
+
+
+async def test_not_ready_before_first_probe():
+    prober = make_prober(FakeDatabase(), last_scanned_block=HEAD_BLOCK)
+
+    response = Response()
+    assert not _report(response, prober.readiness())['healthy']
+    assert response.status_code == 503
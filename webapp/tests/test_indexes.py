@@ -0,0 +1,66 @@
+import pytest
+
+from nft.app.internal.indexes import (HOT_QUERIES, INDEXES, _has_stage,
+                                      find_collection_scans)
+
+pytestmark = pytest.mark.anyio
+
+IXSCAN = {'stage': 'IXSCAN', 'indexName': 'intent_id'}
+COLLSCAN = {'stage': 'COLLSCAN', 'direction': 'forward'}
+
+
+def filter_fields(query_filter: dict):
+    for key, value in query_filter.items():
+        if key in ('$and', '$or'):
+            for branch in value:
+                yield from filter_fields(branch)
+        else:
+            yield key
+
+
+@pytest.mark.parametrize('plan, has_collscan', [
+    (IXSCAN, False),
+    (COLLSCAN, True),
+    ({'stage': 'FETCH', 'inputStage': IXSCAN}, False),
+    ({'stage': 'FETCH', 'inputStage': COLLSCAN}, True),
+    ({'stage': 'SORT', 'inputStage': {'stage': 'FETCH',
+                                      'inputStage': COLLSCAN}}, True),
+    ({'stage': 'OR', 'inputStages': [IXSCAN, IXSCAN]}, False),
+    ({'stage': 'FETCH', 'inputStage': {'stage': 'OR',
+                                       'inputStages': [IXSCAN, COLLSCAN]}},
+     True),
+    # Slot based engine wraps the classic plan
+    ({'queryPlan': {'stage': 'SORT', 'inputStage': COLLSCAN}}, True),
+])
+def test_collection_scan_is_found_anywhere_in_the_plan(plan, has_collscan):
+    assert _has_stage(plan, 'COLLSCAN') is has_collscan
+
+
+@pytest.mark.parametrize('name', HOT_QUERIES)
+def test_hot_query_has_an_index(name):
+    # A dropped or renamed index leaves its hot query without an index
+    # whose leading key the query filters on
+    collection, query_filter, _ = HOT_QUERIES[name]
+    fields = set(filter_fields(query_filter))
+
+    assert any(next(iter(index.document['key'])) in fields
+               for index in INDEXES.get(collection, [])), name
+
+
+class ExplainingDatabase:
+    """Explains hot queries of the given collections as collection scans."""
+
+    def __init__(self, unindexed: set[str]):
+        self.unindexed = unindexed
+
+    async def command(self, command: dict) -> dict:
+        collection = command['explain']['find']
+        plan = COLLSCAN if collection in self.unindexed else IXSCAN
+        return {'queryPlanner': {'winningPlan': {'stage': 'FETCH',
+                                                 'inputStage': plan}}}
+
+
+async def test_collection_scans_are_reported_by_query_name():
+    assert await find_collection_scans(ExplainingDatabase(set())) == []
+    assert await find_collection_scans(
+        ExplainingDatabase({'gifts'})) == ['nft gifts']
@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+
+import pytest
+
+from nft.app.routers.metrics import get_metrics
+
+pytestmark = pytest.mark.anyio
+
+
+def fake_cache(hits: int, misses: int, size: int):
+    return SimpleNamespace(stats=lambda: {'hits': hits, 'misses': misses,
+                                          'size': size})
+
+
+async def test_cache_lookups_are_counters():
+    response = await get_metrics(gifts_cache=fake_cache(5, 2, 10),
+                                 nft_status_cache=fake_cache(7, 1, 3))
+    lines = response.body.decode().splitlines()
+
+    assert '# TYPE nft_cache_hits_total counter' in lines
+    assert '# TYPE nft_cache_misses_total counter' in lines
+    assert 'nft_cache_hits_total{cache="gifts"} 5.0' in lines
+    assert 'nft_cache_misses_total{cache="nft_status"} 1.0' in lines
+    assert 'nft_cache_size{cache="gifts"} 10.0' in lines
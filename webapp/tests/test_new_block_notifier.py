@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+
+import pytest
+import websockets
+
+from nft.app.dependencies import NewBlockNotifier
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeWebsocketNode:
+    """Local websocket JSON-RPC server announcing new heads."""
+
+    def __init__(self, subscription_supported=True):
+        self.subscription_supported = subscription_supported
+        self.clients = []
+
+    async def handle(self, ws, *args):
+        request = json.loads(await ws.recv())
+        assert request['method'] == 'eth_subscribe'
+        assert request['params'] == ['newHeads']
+
+        if not self.subscription_supported:
+            await ws.send(json.dumps({
+                'jsonrpc': '2.0', 'id': request['id'],
+                'error': {'code': -32601, 'message': 'method not found'}}))
+            return
+
+        await ws.send(json.dumps({'jsonrpc': '2.0', 'id': request['id'],
+                                  'result': '0xabc'}))
+        self.clients.append(ws)
+        await ws.wait_closed()
+
+    async def announce(self, block_num: int):
+        for ws in self.clients:
+            await ws.send(json.dumps({
+                'jsonrpc': '2.0',
+                'method': 'eth_subscription',
+                'params': {'subscription': '0xabc',
+                           'result': {'number': hex(block_num)}}}))
+
+
+@pytest.fixture
+async def serve():
+    servers = []
+
+    async def _serve(node: FakeWebsocketNode) -> str:
+        server = await websockets.serve(node.handle, '127.0.0.1', 0)
+        servers.append(server)
+        port = server.sockets[0].getsockname()[1]
+        return f'ws://127.0.0.1:{port}'
+
+    yield _serve
+
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.fixture
+async def make_notifier():
+    notifiers = []
+
+    def _make_notifier(ws_uri: str,
+                       subscribed_poll_interval: float = 10
+                       ) -> NewBlockNotifier:
+        notifier = NewBlockNotifier(
+            ws_uri=ws_uri, poll_interval=0.2,
+            subscribed_poll_interval=subscribed_poll_interval,
+            reconnect_delay=0.05, logger=logging.getLogger('test'))
+        notifiers.append(notifier)
+        return notifier
+
+    yield _make_notifier
+
+    for notifier in notifiers:
+        await notifier.stop()
+
+
+async def wait_until(condition, timeout=2):
+    async def _poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(_poll(), timeout)
+
+
+async def test_new_heads_wake_the_scanner(serve, make_notifier):
+    node = FakeWebsocketNode()
+    notifier = make_notifier(await serve(node))
+    notifier.start()
+    await wait_until(lambda: notifier.subscribed and node.clients)
+
+    waiter = asyncio.create_task(notifier.wait())
+    await asyncio.sleep(0)
+    await node.announce(1234)
+
+    # Long before the subscribed poll interval
+    assert await asyncio.wait_for(waiter, 1)
+    assert notifier.latest_block == 1234
+
+
+async def test_rejected_subscription_falls_back_to_polling(serve,
+                                                           make_notifier):
+    notifier = make_notifier(await serve(
+        FakeWebsocketNode(subscription_supported=False)))
+    notifier.start()
+    await asyncio.sleep(0.1)
+
+    assert not notifier.subscribed
+    # The poll interval passes without announcements
+    assert not await asyncio.wait_for(notifier.wait(), 1)
+
+
+async def test_resubscribes_after_disconnect(serve, make_notifier):
+    node = FakeWebsocketNode()
+    notifier = make_notifier(await serve(node))
+    notifier.start()
+    await wait_until(lambda: notifier.subscribed and node.clients)
+
+    await node.announce(1234)
+    await wait_until(lambda: notifier.latest_block == 1234)
+
+    await node.clients.pop().close()
+    # The head announced by the closed subscription is forgotten
+    await wait_until(lambda: notifier.latest_block is None)
+    await wait_until(lambda: notifier.subscribed and node.clients)
+
+    await node.announce(1235)
+    await wait_until(lambda: notifier.latest_block == 1235)
+
+
+async def test_quiet_subscription_is_reported(serve, make_notifier):
+    node = FakeWebsocketNode()
+    notifier = make_notifier(await serve(node), subscribed_poll_interval=0.1)
+    notifier.start()
+    await wait_until(lambda: notifier.subscribed and node.clients)
+
+    await node.announce(1234)
+    assert await asyncio.wait_for(notifier.wait(), 1)
+
+    # Still subscribed, but no new heads arrive
+    assert not await asyncio.wait_for(notifier.wait(), 1)
+    assert notifier.subscribed
+    assert notifier.latest_block == 1234
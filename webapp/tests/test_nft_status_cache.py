@@ -0,0 +1,66 @@
+import asyncio
+import gc
+import logging
+
+import pytest
+
+from nft.app.dependencies import NFTStatusCache
+
+pytestmark = pytest.mark.anyio
+
+
+class FailingCollection:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def find_one(self, *args, **kwargs):
+        await self.release.wait()
+        raise ConnectionError('Mongo is down')
+
+
+@pytest.fixture
+async def unhandled_errors():
+    loop = asyncio.get_running_loop()
+    errors = []
+    loop.set_exception_handler(lambda loop, context: errors.append(context))
+    yield errors
+    loop.set_exception_handler(None)
+
+
+async def test_failed_query_without_waiters_is_retrieved(unhandled_errors):
+    db = type('FakeDatabase', (), {'intent_ids': FailingCollection()})()
+    cache = NFTStatusCache(db, max_size=10, ttl=10,
+                           logger=logging.getLogger('test'))
+
+    waiters = [asyncio.create_task(cache.get('1', '1')) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    # Long poll clients disconnect before the query fails
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+
+    db.intent_ids.release.set()
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert cache.stats()['in_flight'] == 0
+
+    del waiters
+    gc.collect()
+    assert not unhandled_errors
+
+
+async def test_query_cancelled_before_it_runs_is_forgotten(db):
+    cache = NFTStatusCache(db, max_size=10, ttl=10,
+                           logger=logging.getLogger('test'))
+
+    waiter = asyncio.create_task(cache.get('1', '1'))
+    await asyncio.sleep(0)
+    # E.g. tasks cancelled on shutdown, the query never got to run
+    for query in cache._in_flight.values():
+        query.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert cache.stats()['in_flight'] == 0
@@ -0,0 +1,131 @@
+import aiohttp
+import pytest
+from aiohttp import web
+
+from nft.app.dependencies import Notification, NotificationSender
+
+pytestmark = pytest.mark.anyio
+
+
+class StubPlatform:
+    """Local HTTP server in place of the ML platform notification API."""
+
+    def __init__(self, failing_paths=()):
+        self.failing_paths = set(failing_paths)
+        self.requests: list[tuple[str, dict]] = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append((request.path, await request.json()))
+        if request.path in self.failing_paths:
+            return web.Response(status=503)
+        return web.json_response({'status': 'ok'})
+
+
+class StubPlatformClient:
+    """The part of `MLPlatformAsyncClient` used to send notifications."""
+
+    def __init__(self, base_url: str, session: aiohttp.ClientSession):
+        self.base_url = base_url
+        self.session = session
+
+    async def post_sms(self, mobile_phone: str, message: str):
+        return await self._post('/sms', {'mobile_phone': mobile_phone,
+                                         'message': message})
+
+    async def post_notification(self, notification_type: str,
+                                metadata: dict):
+        return await self._post('/notifications',
+                                {'notification_type': notification_type,
+                                 'metadata': metadata})
+
+    async def _post(self, path: str, payload: dict):
+        async with self.session.post(self.base_url + path,
+                                     json=payload) as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+@pytest.fixture
+async def serve():
+    runners = []
+    sessions = []
+
+    async def _serve(platform: StubPlatform) -> StubPlatformClient:
+        app = web.Application()
+        app.router.add_post('/{path}', platform.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        runners.append(runner)
+
+        session = aiohttp.ClientSession()
+        sessions.append(session)
+        port = runner.addresses[0][1]
+        return StubPlatformClient(f'http://127.0.0.1:{port}', session)
+
+    yield _serve
+
+    for session in sessions:
+        await session.close()
+    for runner in runners:
+        await runner.cleanup()
+
+
+@pytest.fixture
+def sender():
+    return NotificationSender(
+        notification_name='Conversion', sms_rate_limit=1000, sms_burst=100,
+        sms_concurrency=10, telegram_rate_limit=1000, telegram_burst=100,
+        telegram_concurrency=2, digest_notification_name='ConversionDigest')
+
+
+def make_notification(nft_id: int, channels=(NotificationSender.SMS,
+                                              NotificationSender.TELEGRAM)):
+    return Notification(
+        nft_id=str(nft_id), nft_category='common',
+        gifts=[{'smsShortName': 'Gift', 'promoCode': f'CODE{nft_id}'}],
+        phone=f'+7900000{nft_id:04d}', channels=channels)
+
+
+async def test_batch_collapses_telegram_into_digest(serve, sender):
+    platform = StubPlatform()
+    client = await serve(platform)
+
+    results = await sender.send_batch(
+        client, [make_notification(nft_id) for nft_id in range(20)])
+
+    assert results == [{'sms': None, 'telegram': None}] * 20
+    paths = [path for path, _ in platform.requests]
+    assert paths.count('/sms') == 20
+    assert paths.count('/notifications') == 1
+
+    digest = next(payload for path, payload in platform.requests
+                  if path == '/notifications')
+    assert digest['notification_type'] == 'ConversionDigest'
+    assert len(digest['metadata']['conversions']) == 20
+
+
+async def test_single_notification_keeps_regular_template(serve, sender):
+    platform = StubPlatform()
+    client = await serve(platform)
+
+    await sender.send_batch(client, [make_notification(1)])
+
+    notification = next(payload for path, payload in platform.requests
+                        if path == '/notifications')
+    assert notification['notification_type'] == 'Conversion'
+    assert notification['metadata']['nft_id'] == '1'
+
+
+async def test_failures_are_reported_per_channel(serve, sender):
+    platform = StubPlatform(failing_paths={'/notifications'})
+    client = await serve(platform)
+
+    results = await sender.send_batch(client, [
+        make_notification(1),
+        make_notification(2, channels=(NotificationSender.SMS,))])
+
+    assert results[0]['sms'] is None
+    assert isinstance(results[0]['telegram'], aiohttp.ClientResponseError)
+    assert results[1] == {'sms': None}
@@ -0,0 +1,59 @@
+import itertools
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import ValidationError
+
+from nft.app.config import runtime_config
+from nft.app.schemas import NFTConversionRequest
+
+PHONE = '+79990000000'
+
+
+def validate(category_id: str, nft_id: str) -> tuple | None:
+    """Location of the validation error, None if valid."""
+
+    try:
+        NFTConversionRequest(category_id=category_id, nft_id=nft_id,
+                             phone=PHONE)
+    except ValidationError as e:
+        return e.errors()[0]['loc']
+    return None
+
+
+def test_token_is_checked_against_its_category():
+    smallest = min(runtime_config.category_token_map,
+                   key=runtime_config.category_token_map.get)
+    total = runtime_config.category_token_map[smallest]
+
+    assert validate(smallest, str(total)) is None
+    # The error stays on the field clients parse from the 422 body
+    assert validate(smallest, str(total + 1)) == ('nft_id',)
+    assert validate(smallest, 'abc') == ('nft_id',)
+    assert validate('unknown', '1') == ('category_id',)
+
+
+def test_concurrent_validations_use_their_own_category():
+    # Tokens right at and right past the limit of every category,
+    # interleaved so that neighbouring requests have different limits
+    cases = [
+        (category_id, str(token), token <= total)
+        for category_id, total
+        in runtime_config.category_token_map.items()
+        for token in (total, total + 1)
+    ] * 3000
+    cases = list(itertools.chain.from_iterable(zip(cases, reversed(cases))))
+
+    # Switch threads as often as possible, so that they interleave
+    # inside a validation
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda case: validate(case[0], case[1]), cases))
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    for (category_id, nft_id, valid), loc in zip(cases, results):
+        assert (loc is None) == valid, (category_id, nft_id)